@@ -0,0 +1,241 @@
+"""Process-pool scheduler that fans a batch of PDFs out over worker processes."""
+import os
+import time
+import threading
+import multiprocessing
+from collections import deque
+from contextlib import nullcontext
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+from converter_core import PDFConverter, prepare_worker
+from tabula_backend import jpype_available, start_jvm, tabula_usable
+from metrics import MetricsRecorder, profiled
+from job_journal import JOURNAL_FILE, JobJournal, output_settings_key, source_state
+from memory_limits import MB, current_rss, peak_rss, release_memory, reset_peak
+
+
+def resolve_workers(workers, file_count):
+    if not workers or workers < 1:
+        workers = os.cpu_count() or 1
+    return max(1, min(workers, file_count))
+
+
+def convert_file_task(pdf_file, options):
+    # Runs inside a worker process; log lines travel back with the result
+    messages = []
+    converter = PDFConverter(options, logger=messages.append)
+    source = None
+    if options.resume:
+        try:
+            source = source_state(pdf_file)
+        except OSError:
+            pass
+    profile = nullcontext()
+    if options.profile_file and os.path.basename(pdf_file) == os.path.basename(options.profile_file):
+        profile = profiled(os.path.splitext(converter.output_path(pdf_file))[0], messages.append)
+
+    reset_peak()
+    start = time.perf_counter()
+    try:
+        with profile:
+            success = converter.convert_single_file(pdf_file)
+    except Exception as e:
+        messages.append(f"Error converting {os.path.basename(pdf_file)}: {str(e)}")
+        success = False
+    seconds = time.perf_counter() - start
+    memory = file_memory()
+    converter.timer.add('convert', seconds, success=success, peak_rss_mb=round(memory['peak'] / MB, 1))
+    return {
+        'file': pdf_file,
+        'success': success,
+        'output_file': converter.output_files[0] if converter.output_files else converter.output_path(pdf_file),
+        'messages': messages,
+        'cache': converter.cache_stats,
+        'timings': converter.timer.records,
+        'source': source,
+        'memory': memory,
+    }
+
+
+def file_memory():
+    # Peak while converting, then what the worker still holds once the file's objects are freed
+    peak = peak_rss() or 0
+    release_memory()
+    return {'peak': peak, 'rss': current_rss() or 0}
+
+
+def worker_pool(options, workers):
+    # spawn keeps workers free of the parent's threads and Tk state; each worker
+    # starts its engine once and keeps it for every file it is handed
+    context = multiprocessing.get_context('spawn')
+    return ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=prepare_worker,
+                               initargs=(options.conversion_method,))
+
+
+def over_memory_ceiling(result, options):
+    memory = result.get('memory')
+    return bool(options.max_worker_memory_mb and memory and memory['rss'] > options.max_worker_memory_mb * MB)
+
+
+class BatchConverter:
+    def __init__(self, options, logger=None, progress_callback=None, cancel_event=None):
+        self.options = options
+        self.logger = logger
+        self.progress_callback = progress_callback
+        # Set from any thread to stop handing out files; files already converting finish
+        self.cancel_event = cancel_event or threading.Event()
+        self.metrics = None
+        if options.metrics_file or options.prometheus_file:
+            self.metrics = MetricsRecorder(options.metrics_file, options.prometheus_file)
+
+    def log(self, message):
+        if self.logger:
+            self.logger(message)
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def journal_path(self):
+        return self.options.journal_file or os.path.join(self.options.output_directory, JOURNAL_FILE)
+
+    def convert_files(self, pdf_files):
+        if not self.options.resume:
+            return self.run_batch(pdf_files, None)
+        with JobJournal(self.journal_path()) as journal:
+            return self.run_batch(pdf_files, journal)
+
+    def run_batch(self, pdf_files, journal):
+        total_files = len(pdf_files)
+        summary = {'success': [], 'fail': [], 'skipped': [], 'cancelled': [], 'cache': {'hits': 0, 'misses': 0}}
+        if not total_files:
+            return summary
+
+        settings_key = output_settings_key(self.options)
+        pending = pdf_files
+        if journal:
+            pending = []
+            for pdf_file in pdf_files:
+                if journal.is_complete(pdf_file, settings_key):
+                    summary['skipped'].append(os.path.basename(pdf_file))
+                else:
+                    pending.append(pdf_file)
+            self.log(f"Resuming from {self.journal_path()}: {len(summary['skipped'])} of {total_files} files "
+                     f"already converted and unchanged")
+            if self.progress_callback and summary['skipped']:
+                self.progress_callback(len(summary['skipped']), total_files)
+            if not pending:
+                self.log("Nothing left to convert")
+                return summary
+
+        workers = resolve_workers(self.options.workers, len(pending))
+        self.log(f"Converting {len(pending)} files with {workers} worker(s)")
+        uses_tabula = self.options.conversion_method == "tabula" or (
+            self.options.conversion_method == "auto" and tabula_usable())
+        if uses_tabula and not jpype_available():
+            self.log("jpype is not installed: tabula will start a new Java process for every call")
+
+        finished = set()
+        for done, result in enumerate(self.iter_results(pending, workers), len(summary['skipped']) + 1):
+            self.record_result(result, summary)
+            finished.add(result['file'])
+            if journal:
+                journal.record(result, settings_key)
+            if self.progress_callback:
+                self.progress_callback(done, total_files)
+
+        if self.cancel_event.is_set():
+            summary['cancelled'] = [os.path.basename(pdf_file) for pdf_file in pending if pdf_file not in finished]
+            if summary['cancelled']:
+                self.log(f"Cancelled: {len(summary['cancelled'])} files were not converted")
+        converted = len(summary['success']) + len(summary['skipped'])
+        self.log(f"Conversion complete! {converted}/{total_files} files converted successfully")
+        if self.options.use_cache or self.options.use_page_cache:
+            self.log(f"Extraction cache: {summary['cache']['hits']} hits, {summary['cache']['misses']} misses")
+        if self.metrics and self.options.prometheus_file:
+            try:
+                self.metrics.write_prometheus()
+            except Exception as e:
+                self.log(f"Could not write metrics file: {str(e)}")
+        return summary
+
+    def iter_results(self, pdf_files, workers):
+        # A memory ceiling needs a worker process that can be replaced, even for one worker
+        if workers == 1 and not self.options.max_worker_memory_mb:
+            if self.options.conversion_method in ("tabula", "auto") and tabula_usable():
+                try:
+                    startup = start_jvm()
+                    if startup:
+                        self.log(f"Started tabula JVM in {startup:.2f}s")
+                except Exception as e:
+                    self.log(f"Could not start tabula JVM: {str(e)}")
+            for pdf_file in pdf_files:
+                if self.cancel_event.is_set():
+                    return
+                self.log(f"Converting: {os.path.basename(pdf_file)}")
+                yield convert_file_task(pdf_file, self.options)
+            return
+
+        # Files are handed out one per idle worker. A worker left holding more than
+        # max_worker_memory_mb after a file, or one that died (the OOM killer), retires
+        # the pool: no new files are handed out, the files in progress finish, and a
+        # fresh pool takes the remaining files
+        pending = deque(pdf_files)
+        while pending and not self.cancel_event.is_set():
+            with worker_pool(self.options, workers) as executor:
+                futures = {}
+                recycle = False
+                while True:
+                    while pending and len(futures) < workers and not recycle and not self.cancel_event.is_set():
+                        pdf_file = pending.popleft()
+                        futures[executor.submit(convert_file_task, pdf_file, self.options)] = pdf_file
+                    if not futures:
+                        break
+                    done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        result = self.future_result(future, futures.pop(future))
+                        if not recycle and pending:
+                            if isinstance(future.exception(), BrokenProcessPool):
+                                recycle = True
+                                self.log("A worker process died; starting new workers for the remaining files")
+                            elif over_memory_ceiling(result, self.options):
+                                recycle = True
+                                self.log(f"Worker holds {result['memory']['rss'] / MB:.0f} MB after "
+                                         f"{os.path.basename(result['file'])}, over the "
+                                         f"{self.options.max_worker_memory_mb} MB ceiling; recycling workers")
+                        yield result
+
+    def future_result(self, future, pdf_file):
+        try:
+            return future.result()
+        except Exception as e:
+            return {
+                'file': pdf_file,
+                'success': False,
+                'output_file': None,
+                'messages': [f"Worker failed on {os.path.basename(pdf_file)}: {str(e)}"],
+                'cache': {},
+                'timings': [],
+                'source': None,
+                'memory': None,
+            }
+
+    def record_result(self, result, summary):
+        name = os.path.basename(result['file'])
+        for message in result['messages']:
+            self.log(message)
+        for stat, count in result['cache'].items():
+            summary['cache'][stat] += count
+        if self.metrics:
+            try:
+                self.metrics.record_file(result['file'], result['success'], result['timings'])
+            except Exception as e:
+                self.log(f"Could not record metrics: {str(e)}")
+        memory = result.get('memory')
+        if memory and (self.options.memory_bounded or self.options.max_worker_memory_mb):
+            self.log(f"{name}: peak memory {memory['peak'] / MB:.0f} MB, {memory['rss'] / MB:.0f} MB held after")
+        if result['success']:
+            summary['success'].append(name)
+            self.log(f"✓ Successfully converted: {name}")
+        else:
+            summary['fail'].append(name)
+            self.log(f"✗ Failed to convert: {name}")
@@ -0,0 +1,122 @@
+"""Parser passes and open time per file: separate opens per step vs. one DocumentSession.
+
+    python benchmarks/bench_document_session.py statement.pdf [--password secret]
+
+Each scenario replays the opens one conversion path made before the
+session existed, and the same steps through a session. Passes are counted
+by wrapping ``PyPDF2.PdfReader`` and ``pdfplumber.open``, so the numbers
+are what the run actually parsed. Page-chunk workers parse their own chunk
+in both cases and are not counted.
+"""
+import os
+import sys
+import time
+import argparse
+import PyPDF2
+import pdfplumber
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from document_session import DocumentSession
+from extraction_cache import page_fingerprints
+
+PASSES = {'PyPDF2': 0, 'pdfplumber': 0}
+
+
+def counted(name, parser):
+    def wrapper(*args, **kwargs):
+        PASSES[name] += 1
+        return parser(*args, **kwargs)
+    return wrapper
+
+
+PyPDF2.PdfReader = counted('PyPDF2', PyPDF2.PdfReader)
+pdfplumber.open = counted('pdfplumber', pdfplumber.open)
+
+
+def open_reader(pdf_file, password):
+    pdf_reader = PyPDF2.PdfReader(pdf_file)
+    if pdf_reader.is_encrypted:
+        pdf_reader.decrypt(password or '')
+    return pdf_reader
+
+
+def password_check(pdf_file):
+    return PyPDF2.PdfReader(pdf_file).is_encrypted
+
+
+def separate_pdfplumber(pdf_file, password):
+    # Password check, then pdfplumber opens the file for extraction
+    password_check(pdf_file)
+    with pdfplumber.open(pdf_file, password=password or None) as pdf:
+        len(pdf.pages)
+
+
+def separate_page_cache(pdf_file, password):
+    # As above, with the page cache reading its own PyPDF2 copy for fingerprints
+    password_check(pdf_file)
+    page_fingerprints(open_reader(pdf_file, password).pages)
+    with pdfplumber.open(pdf_file, password=password or None) as pdf:
+        len(pdf.pages)
+
+
+def separate_page_chunks(pdf_file, password):
+    # Password check, then a second PyPDF2 read to count pages for chunking
+    password_check(pdf_file)
+    len(open_reader(pdf_file, password).pages)
+
+
+def session_pdfplumber(pdf_file, password):
+    with DocumentSession(pdf_file, password) as document:
+        document.is_encrypted
+        len(document.plumber().pages)
+
+
+def session_page_cache(pdf_file, password):
+    with DocumentSession(pdf_file, password) as document:
+        document.is_encrypted
+        document.page_fingerprints()
+        len(document.plumber().pages)
+
+
+def session_page_chunks(pdf_file, password):
+    with DocumentSession(pdf_file, password) as document:
+        document.is_encrypted
+        document.page_count
+
+
+SCENARIOS = {
+    'pdfplumber': (separate_pdfplumber, session_pdfplumber),
+    'pdfplumber + page cache': (separate_page_cache, session_page_cache),
+    'page-chunk count': (separate_page_chunks, session_page_chunks),
+}
+
+
+def timed(func, *args):
+    for name in PASSES:
+        PASSES[name] = 0
+    start = time.perf_counter()
+    func(*args)
+    return sum(PASSES.values()), time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('pdf_file')
+    parser.add_argument('--password', default='')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    for scenario, funcs in SCENARIOS.items():
+        results = []
+        for func in funcs:
+            runs = [timed(func, args.pdf_file, args.password) for _ in range(args.repeat)]
+            results.append((runs[0][0], min(seconds for _, seconds in runs)))
+        (before, before_seconds), (after, after_seconds) = results
+        print(f"{scenario:<24} separate: {before} passes {before_seconds:.3f} s   "
+              f"session: {after} passes {after_seconds:.3f} s   "
+              f"passes removed per file: {before - after}")
+
+
+if __name__ == "__main__":
+    main()
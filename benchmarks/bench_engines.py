@@ -0,0 +1,206 @@
+"""Throughput of each extraction engine plus the Excel write over a synthetic corpus.
+
+    python benchmarks/bench_engines.py --pages 5 50 --output results.json
+    python benchmarks/bench_engines.py --baseline results.json
+
+Every (document, engine) case runs in a fresh process so its peak RSS is its
+own. Results are written as JSON; with ``--baseline`` each case is compared
+against an earlier run and slowdowns beyond ``--tolerance`` fail the run.
+"""
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import tempfile
+import multiprocessing
+from contextlib import ExitStack
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic_corpus import corpus_specs, ensure_corpus
+
+ENGINES = ('tabula', 'camelot', 'pdfplumber')
+LIBRARIES = ('pandas', 'openpyxl', 'pdfplumber', 'PyPDF2', 'camelot', 'tabula')
+
+
+def peak_rss_mb():
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def run_case(pdf_file, password, engine, output_directory):
+    # Runs in its own worker process
+    from converter_core import ConversionOptions, PDFConverter
+    from tabula_backend import start_jvm, tabula_usable
+
+    if engine == 'tabula':
+        if not tabula_usable():
+            return {'error': "skipped: no Java runtime"}
+        start_jvm()
+
+    messages = []
+    options = ConversionOptions(output_directory=output_directory, conversion_method=engine, password=password)
+    converter = PDFConverter(options, logger=messages.append)
+    stages = {}
+    with ExitStack() as stack:
+        start = time.perf_counter()
+        document = stack.enter_context(converter.open_document(pdf_file))
+        converter.is_password_protected(pdf_file)
+        page_count = document.page_count
+        stages['open'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        tables = converter.extract_tables(pdf_file)
+        stages['extract'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        if tables:
+            converter.save_to_excel(tables, converter.output_path(pdf_file), pdf_file)
+        stages['excel_write'] = time.perf_counter() - start
+
+    return {
+        'pages': page_count,
+        'tables': len(tables),
+        'rows': sum(len(table) for table in tables),
+        'stages': stages,
+        'peak_rss_mb': peak_rss_mb(),
+        'messages': messages,
+    }
+
+
+def run_isolated(pdf_file, password, engine, output_directory):
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+        try:
+            return executor.submit(run_case, pdf_file, password, engine, output_directory).result()
+        except Exception as e:
+            return {'error': str(e)}
+
+
+def best_of(runs):
+    # Fastest time per stage across repeats, highest peak memory
+    result = dict(runs[0])
+    result['stages'] = {stage: min(run['stages'][stage] for run in runs) for stage in runs[0]['stages']}
+    peaks = [run['peak_rss_mb'] for run in runs if run['peak_rss_mb'] is not None]
+    result['peak_rss_mb'] = max(peaks) if peaks else None
+    return result
+
+
+def benchmark(corpus, engines, repeat, output_directory):
+    cases = []
+    for spec, path in corpus:
+        for engine in engines:
+            runs = [run_isolated(path, spec.password, engine, output_directory) for _ in range(repeat)]
+            failed = next((run for run in runs if 'error' in run), None)
+            case = {'document': spec.name, 'engine': engine, 'pages': spec.pages, 'rows_per_page': spec.rows,
+                    'cols': spec.cols, 'ruled': spec.ruled, 'encrypted': spec.encrypted}
+            if failed:
+                case['error'] = failed['error']
+            else:
+                result = best_of(runs)
+                total = sum(result['stages'].values())
+                case.update(
+                    tables=result['tables'],
+                    rows=result['rows'],
+                    stages={stage: round(seconds, 4) for stage, seconds in result['stages'].items()},
+                    total_seconds=round(total, 4),
+                    pages_per_sec=round(result['pages'] / total, 2) if total else None,
+                    rows_per_sec=round(result['rows'] / total, 1) if total else None,
+                    peak_rss_mb=result['peak_rss_mb'],
+                    messages=result['messages'],
+                )
+            print(summary_line(case), file=sys.stderr)
+            cases.append(case)
+    return cases
+
+
+def summary_line(case):
+    label = f"{case['engine']:<10} {case['document']:<32}"
+    if 'error' in case:
+        return f"{label} {case['error']}"
+    return (f"{label} {case['pages_per_sec']:>8} pages/s {case['rows_per_sec']:>10} rows/s "
+            f"{case['peak_rss_mb']} MB peak")
+
+
+def library_versions():
+    from importlib.metadata import version, PackageNotFoundError
+
+    versions = {}
+    for name in LIBRARIES:
+        try:
+            versions[name] = version('camelot-py' if name == 'camelot' else
+                                     'tabula-py' if name == 'tabula' else name)
+        except PackageNotFoundError:
+            versions[name] = None
+    return versions
+
+
+def compare(cases, baseline_cases, tolerance):
+    """Print pages/sec against the baseline; returns the number of regressions."""
+    baseline = {(case['document'], case['engine']): case for case in baseline_cases}
+    regressions = 0
+    for case in cases:
+        before = baseline.get((case['document'], case['engine']))
+        if not before or not case.get('pages_per_sec') or not before.get('pages_per_sec'):
+            continue
+        ratio = case['pages_per_sec'] / before['pages_per_sec']
+        flag = ""
+        if ratio < 1 - tolerance:
+            regressions += 1
+            flag = "  REGRESSION"
+        print(f"{case['engine']:<10} {case['document']:<32} {ratio:6.2f}x baseline{flag}", file=sys.stderr)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--pages', type=int, nargs='+', default=[5])
+    parser.add_argument('--rows', type=int, nargs='+', default=[40])
+    parser.add_argument('--cols', type=int, nargs='+', default=[4, 8])
+    parser.add_argument('--engines', nargs='+', choices=ENGINES, default=list(ENGINES))
+    parser.add_argument('--repeat', type=int, default=1)
+    parser.add_argument('--corpus-dir', help="Reuse generated PDFs from this directory")
+    parser.add_argument('--output', help="Write JSON results here instead of stdout")
+    parser.add_argument('--baseline', help="Earlier JSON results to compare against")
+    parser.add_argument('--tolerance', type=float, default=0.1,
+                        help="Allowed pages/sec drop against the baseline (default: 0.1)")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as scratch:
+        corpus_dir = args.corpus_dir or os.path.join(scratch, 'corpus')
+        output_directory = os.path.join(scratch, 'xlsx')
+        os.makedirs(output_directory)
+        corpus = ensure_corpus(corpus_dir, corpus_specs(args.pages, args.rows, args.cols))
+        cases = benchmark(corpus, args.engines, args.repeat, output_directory)
+
+    results = {
+        'generated': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'libraries': library_versions(),
+        'cases': cases,
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(results, file, indent=2)
+    else:
+        print(json.dumps(results, indent=2))
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as file:
+            if compare(cases, json.load(file)['cases'], args.tolerance):
+                sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Column-width formatting cost per million cells: per-cell rescan vs. vectorised.
+
+    python benchmarks/bench_formatting.py --rows 200000 --cols 10
+"""
+import os
+import sys
+import time
+import argparse
+import numpy as np
+import pandas as pd
+from openpyxl import Workbook
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from writers import column_widths, apply_column_widths
+
+
+def make_table(rows, cols, seed=0):
+    rng = np.random.default_rng(seed)
+    data = {}
+    for col in range(cols):
+        amounts = rng.integers(0, 10 ** rng.integers(3, 9), size=rows)
+        data[f"Column {col + 1}"] = [f"{value:,}.00" for value in amounts]
+    return pd.DataFrame(data)
+
+
+def filled_worksheet(table):
+    worksheet = Workbook().active
+    worksheet.append(list(table.columns))
+    for row in table.itertuples(index=False, name=None):
+        worksheet.append(row)
+    return worksheet
+
+
+def rescan_widths(worksheet):
+    # The previous format_excel_sheet loop, kept here as the baseline
+    for column in worksheet.columns:
+        max_length = 0
+        column_letter = column[0].column_letter
+
+        for cell in column:
+            try:
+                if len(str(cell.value)) > max_length:
+                    max_length = len(str(cell.value))
+            except Exception:
+                pass
+
+        worksheet.column_dimensions[column_letter].width = min(max_length + 2, 50)
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--cols', type=int, default=10)
+    parser.add_argument('--sample-rows', type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    table = make_table(args.rows, args.cols)
+    worksheet = filled_worksheet(table)
+    million_cells = (args.rows + 1) * args.cols / 1e6
+
+    results = {
+        'rescan': timed(rescan_widths, worksheet),
+        'vectorised': timed(lambda: apply_column_widths(worksheet, column_widths(table))),
+        f'vectorised_sample_{args.sample_rows}': timed(
+            lambda: apply_column_widths(worksheet, column_widths(table, args.sample_rows))),
+    }
+
+    print(f"{args.rows} rows x {args.cols} cols ({million_cells:.2f}M cells)")
+    for name, seconds in results.items():
+        print(f"  {name:<28} {seconds:8.3f} s   {seconds / million_cells:8.3f} s per 1M cells")
+
+
+if __name__ == "__main__":
+    main()
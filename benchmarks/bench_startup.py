@@ -0,0 +1,87 @@
+"""Cold-start time of the GUI and CLI entry points, and what each engine adds on first use.
+
+    python benchmarks/bench_startup.py --max-seconds 0.5
+
+Every case runs in a fresh interpreter, several times, and the median is
+reported. Entry points must import cleanly and must not import pandas or
+an extraction engine; one that fails, imports one, or whose median is over
+``--max-seconds`` fails the run. Engines that are not installed are skipped.
+"""
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ('pandas', 'numpy', 'tabula', 'PyPDF2', 'openpyxl', 'camelot', 'cv2', 'pdfplumber')
+
+# Startup cases are held to the target; engine cases show the cost deferred to first use
+STARTUP_CASES = {
+    'cli module': "import cli",
+    'gui module': "import pdf_to_excel",
+    'watch module': "import watch_folder",
+    'service module': "import service",
+}
+ENGINE_CASES = {f"{engine} engine": f"from converter_core import preload_engine; preload_engine({engine!r})"
+                for engine in ('pdfplumber', 'camelot', 'tabula', 'auto')}
+
+PROBE = """
+import sys, time, json
+start = time.perf_counter()
+{statement}
+seconds = time.perf_counter() - start
+print(json.dumps({{'seconds': seconds, 'heavy': [name for name in {heavy!r} if name in sys.modules]}}))
+"""
+
+
+def run_case(statement, repeats):
+    code = PROBE.format(statement=statement, heavy=HEAVY_MODULES)
+    runs = []
+    for _ in range(repeats):
+        output = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True)
+        runs.append(json.loads(output.stdout.strip().splitlines()[-1]))
+    return statistics.median(run['seconds'] for run in runs), runs[-1]['heavy']
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--max-seconds', type=float, default=0.5,
+                        help="Median import time an entry point may take (default: 0.5)")
+    parser.add_argument('--skip-engines', action='store_true', help="Only time the entry points")
+    args = parser.parse_args(argv)
+
+    failures = 0
+    for label, statement in STARTUP_CASES.items():
+        try:
+            seconds, heavy = run_case(statement, args.repeats)
+        except subprocess.CalledProcessError as e:
+            # An entry point that cannot be imported is broken, not optional
+            failures += 1
+            print(f"{label:<18} FAIL: {e.stderr.strip().splitlines()[-1]}")
+            continue
+        problems = []
+        if seconds > args.max_seconds:
+            problems.append(f"over {args.max_seconds:.2f} s")
+        if heavy:
+            problems.append(f"imports {', '.join(heavy)}")
+        failures += bool(problems)
+        print(f"{label:<18} {seconds * 1000:8.0f} ms  {'FAIL: ' + '; '.join(problems) if problems else 'ok'}")
+
+    if not args.skip_engines:
+        for label, statement in ENGINE_CASES.items():
+            try:
+                seconds, heavy = run_case(statement, args.repeats)
+            except subprocess.CalledProcessError as e:
+                print(f"{label:<18} skipped: {e.stderr.strip().splitlines()[-1]}")
+                continue
+            print(f"{label:<18} {seconds * 1000:8.0f} ms  on first use ({', '.join(heavy)})")
+
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
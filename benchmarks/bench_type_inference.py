@@ -0,0 +1,96 @@
+"""Type inference throughput: column-wise pandas conversion against a per-cell Python loop.
+
+    python benchmarks/bench_type_inference.py --rows 1000000 --distinct 1000000
+"""
+import os
+import re
+import sys
+import time
+import argparse
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from type_inference import infer_types
+
+
+def make_text_table(rows, distinct=1000, seed=0):
+    # Every column is text, the way extractors return it; each column repeats ``distinct`` values
+    rng = np.random.default_rng(seed)
+    amounts = rng.uniform(-50000, 50000, distinct).round(2)
+    amount_text = [f"({-value:,.2f})" if value < 0 else f"{value:,.2f}" for value in amounts]
+    dates = pd.date_range('1900-01-01', periods=min(distinct, 100000), freq='D').strftime('%d/%m/%Y')
+    return pd.DataFrame({
+        'Reference': [f"INV-{i:07d}" for i in range(rows)],
+        'Date': np.resize(dates.to_numpy(), rows),
+        'Amount': np.resize(amount_text, rows),
+        'Price': np.resize([f"${value:,.2f}" for value in rng.uniform(1, 5000, distinct)], rows),
+        'Quantity': rng.integers(1, 10000, rows).astype(str),
+        'Account': np.resize([f"{value:08d}" for value in rng.integers(0, 10**8, distinct)], rows),
+        'Card': np.resize([f"4{value:015d}" for value in rng.integers(0, 10**15, distinct)], rows),
+    })
+
+
+# Columns that must come back as text: leading-zero codes and numbers longer than Excel keeps
+TEXT_COLUMNS = ('Reference', 'Account', 'Card')
+
+
+NUMBER = re.compile(r'^-?\d+(\.\d+)?$')
+
+
+def parse_cell(value):
+    # What a straightforward per-cell implementation does
+    text = value.strip().replace('$', '').replace(',', '')
+    negative = text.startswith('(') and text.endswith(')')
+    text = text.strip('()')
+    if NUMBER.match(text) and not re.match(r'^-?0\d', text):
+        number = float(text)
+        return -number if negative else number
+    for date_format in ('%Y-%m-%d', '%m/%d/%Y', '%d/%m/%Y'):
+        try:
+            return datetime.strptime(value, date_format)
+        except ValueError:
+            pass
+    return value
+
+
+def infer_per_cell(table):
+    return table.apply(lambda column: column.map(parse_cell))
+
+
+def timed(function, table):
+    start = time.perf_counter()
+    result = function(table)
+    return result, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--distinct', type=int, default=1000,
+                        help="Distinct values per column; raise it to --rows for the worst case")
+    parser.add_argument('--loop-rows', type=int, default=100000,
+                        help="Rows for the per-cell comparison, which is far slower (0 to skip)")
+    args = parser.parse_args(argv)
+
+    table = make_text_table(args.rows, args.distinct)
+    result, seconds = timed(infer_types, table)
+    print(f"{args.rows} rows x {len(table.columns)} columns, {args.distinct} distinct values per column")
+    print(f"{'column-wise':<12} {seconds:8.2f} s {args.rows / seconds:12,.0f} rows/s")
+    print("  " + ", ".join(f"{column}: {dtype}" for column, dtype in result.dtypes.items()))
+    converted = [column for column in TEXT_COLUMNS if not pd.api.types.is_string_dtype(result[column])]
+    if converted:
+        sys.exit(f"Converted columns that must stay text: {', '.join(converted)}")
+
+    if args.loop_rows:
+        sample = table.head(args.loop_rows)
+        _, loop_seconds = timed(infer_per_cell, sample)
+        print(f"{'per-cell':<12} {loop_seconds:8.2f} s {len(sample) / loop_seconds:12,.0f} rows/s "
+              f"({len(sample)} rows)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Write throughput of each output format on one large extracted-looking table.
+
+    python benchmarks/bench_writers.py --rows 200000 --cols 8
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_formatting import make_table
+from converter_core import ConversionOptions, PDFConverter
+from writers import OUTPUT_WRITERS
+
+
+def write_in_memory_xlsx(table, output_file, format_output):
+    # The default non-streaming path: pandas' openpyxl writer plus format_excel_sheet
+    converter = PDFConverter(ConversionOptions(format_output=format_output))
+    converter.save_to_excel([table], output_file, output_file)
+    return [output_file]
+
+
+def write_with(writer_class, table, output_file, format_output):
+    writer = writer_class(output_file, format_output=format_output)
+    writer.write_dataframe("Data", table)
+    writer.save()
+    return writer.files
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--cols', type=int, default=8)
+    parser.add_argument('--no-format', action='store_true')
+    args = parser.parse_args(argv)
+
+    table = make_table(args.rows, args.cols)
+    format_output = not args.no_format
+    cases = [('xlsx (in memory)', '.xlsx', lambda path: write_in_memory_xlsx(table, path, format_output))]
+    for name, writer_class in OUTPUT_WRITERS.items():
+        label = f"{name} (streaming)" if name == 'xlsx' else name
+        cases.append((label, writer_class.extension,
+                      lambda path, writer_class=writer_class: write_with(writer_class, table, path, format_output)))
+
+    print(f"{args.rows} rows x {args.cols} columns, formatting {'on' if format_output else 'off'}")
+    with tempfile.TemporaryDirectory() as directory:
+        for label, extension, write in cases:
+            output_file = os.path.join(directory, f"out{extension}")
+            start = time.perf_counter()
+            try:
+                files = write(output_file)
+            except ImportError as e:
+                print(f"{label:<20} skipped: {e}")
+                continue
+            seconds = time.perf_counter() - start
+            size = sum(os.path.getsize(path) for path in files)
+            print(f"{label:<20} {seconds:8.2f} s {args.rows / seconds:12,.0f} rows/s {size / 1024 / 1024:8.1f} MB")
+            for path in files:
+                os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
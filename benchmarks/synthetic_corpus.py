@@ -0,0 +1,121 @@
+"""Deterministic synthetic statement PDFs for the benchmarks, generated offline with reportlab.
+
+    python benchmarks/synthetic_corpus.py corpus/ --pages 5 50 --rows 40 --cols 4 8
+"""
+import os
+import random
+import argparse
+import itertools
+from dataclasses import dataclass
+
+PASSWORD = 'bench'
+PAGE_WIDTH, PAGE_HEIGHT = 612, 792
+MARGIN = 36
+FONT_SIZE = 8
+
+
+@dataclass(frozen=True)
+class CorpusSpec:
+    pages: int
+    rows: int
+    cols: int
+    ruled: bool
+    encrypted: bool
+
+    @property
+    def name(self):
+        layout = "ruled" if self.ruled else "unruled"
+        lock = "-enc" if self.encrypted else ""
+        return f"p{self.pages}-r{self.rows}-c{self.cols}-{layout}{lock}.pdf"
+
+    @property
+    def password(self):
+        return PASSWORD if self.encrypted else ''
+
+
+def corpus_specs(pages, rows, cols, ruled=(True, False), encrypted=(False, True)):
+    return [CorpusSpec(*values) for values in itertools.product(pages, rows, cols, ruled, encrypted)]
+
+
+def cell_text(rng, col, row):
+    if col == 0:
+        return f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+    if col == 1:
+        return f"REF{row:06d}"
+    return f"{rng.randint(0, 999999) / 100:,.2f}"
+
+
+def draw_page(canvas, spec, rng, first_row):
+    col_width = (PAGE_WIDTH - 2 * MARGIN) / spec.cols
+    row_height = min(14, (PAGE_HEIGHT - 2 * MARGIN) / (spec.rows + 1))
+    canvas.setFont("Helvetica", min(FONT_SIZE, row_height - 2))
+
+    lines = [[f"Column {col + 1}" for col in range(spec.cols)]]
+    lines += [[cell_text(rng, col, first_row + row) for col in range(spec.cols)] for row in range(spec.rows)]
+    top = PAGE_HEIGHT - MARGIN
+    for index, line in enumerate(lines):
+        baseline = top - (index + 1) * row_height + 3
+        for col, text in enumerate(line):
+            canvas.drawString(MARGIN + col * col_width + 3, baseline, text)
+
+    if spec.ruled:
+        bottom = top - len(lines) * row_height
+        for index in range(len(lines) + 1):
+            y = top - index * row_height
+            canvas.line(MARGIN, y, PAGE_WIDTH - MARGIN, y)
+        for col in range(spec.cols + 1):
+            x = MARGIN + col * col_width
+            canvas.line(x, top, x, bottom)
+
+
+def build_pdf(spec, path, seed=0):
+    from reportlab.pdfgen.canvas import Canvas
+
+    rng = random.Random(f"{seed}:{spec.name}")
+    target = path + '.plain' if spec.encrypted else path
+    canvas = Canvas(target, pagesize=(PAGE_WIDTH, PAGE_HEIGHT))
+    canvas.setTitle(spec.name)
+    for page in range(spec.pages):
+        draw_page(canvas, spec, rng, page * spec.rows)
+        canvas.showPage()
+    canvas.save()
+
+    if spec.encrypted:
+        import PyPDF2
+
+        writer = PyPDF2.PdfWriter()
+        for page in PyPDF2.PdfReader(target).pages:
+            writer.add_page(page)
+        writer.encrypt(spec.password)
+        with open(path, 'wb') as file:
+            writer.write(file)
+        os.remove(target)
+
+
+def ensure_corpus(directory, specs, seed=0):
+    """Build any missing corpus files; returns (spec, path) pairs in spec order."""
+    os.makedirs(directory, exist_ok=True)
+    corpus = []
+    for spec in specs:
+        path = os.path.join(directory, spec.name)
+        if not os.path.exists(path):
+            build_pdf(spec, path, seed)
+        corpus.append((spec, path))
+    return corpus
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('directory')
+    parser.add_argument('--pages', type=int, nargs='+', default=[5])
+    parser.add_argument('--rows', type=int, nargs='+', default=[40])
+    parser.add_argument('--cols', type=int, nargs='+', default=[4, 8])
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    for spec, path in ensure_corpus(args.directory, corpus_specs(args.pages, args.rows, args.cols), args.seed):
+        print(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+"""Headless command-line entry point for batch conversions."""
+import os
+import sys
+import signal
+import argparse
+import threading
+from converter_core import EXTRACTION_METHODS, OUTPUT_FORMATS, SETTINGS_FILE, load_options, timestamped
+from batch import BatchConverter
+from event_channel import EventChannel, follow
+from watch_folder import FolderWatcher
+
+
+def collect_pdf_files(paths):
+    pdf_files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                if name.lower().endswith('.pdf'):
+                    pdf_files.append(os.path.join(path, name))
+        else:
+            pdf_files.append(path)
+    return pdf_files
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog='pdf_to_excel',
+        description="Convert tables from PDF files to Excel without the GUI."
+    )
+    parser.add_argument('inputs', nargs='+', help="PDF files or directories containing PDFs")
+    parser.add_argument('-o', '--output-dir', help="Directory for the generated workbooks")
+    parser.add_argument('-m', '--method', choices=EXTRACTION_METHODS, help="Extraction method")
+    parser.add_argument('-p', '--password', help="Password for encrypted PDFs")
+    parser.add_argument('--pages', help="Page range, e.g. 1-5, 1,3,5 or 1- (default: all pages)")
+    parser.add_argument('--single-table', action='store_true', help="Do not split pages into multiple tables")
+    parser.add_argument('--stitch', action='store_true',
+                        help="Join tables that continue across pages into one sheet per table")
+    parser.add_argument('--infer-types', action='store_true',
+                        help="Write numeric and date columns as numbers and dates instead of text")
+    parser.add_argument('--no-format', action='store_true', help="Skip header styling and column widths")
+    parser.add_argument('--metadata', action='store_true', help="Add a Metadata sheet to each workbook")
+    parser.add_argument('-f', '--format', choices=OUTPUT_FORMATS,
+                        help="Output format: xlsx (openpyxl), xlsxwriter (faster xlsx), csv or parquet")
+    parser.add_argument('--streaming', action='store_true',
+                        help="Stream rows into a write-only workbook to keep memory flat on huge outputs")
+    parser.add_argument('--memory-bounded', action='store_true',
+                        help="Free each page after extraction and write tables as they arrive (implies --streaming)")
+    parser.add_argument('--max-worker-memory', type=int, metavar='MB',
+                        help="Replace worker processes left holding more than this much memory after a file")
+    parser.add_argument('--width-sample-rows', type=int,
+                        help="Rows measured when sizing columns (default: all rows)")
+    parser.add_argument('--skip-table-free', action='store_true',
+                        help="Skip pages with no ruling lines or column-aligned text before extraction")
+    parser.add_argument('--min-aligned-rows', type=int,
+                        help="Aligned text rows an unruled page needs to count as a table (default: 3)")
+    parser.add_argument('--cache', action='store_true', help="Reuse extractions of unchanged PDFs")
+    parser.add_argument('--page-cache', action='store_true',
+                        help="Cache extractions per page so grown or re-ranged PDFs only extract new pages")
+    parser.add_argument('--cache-dir', help="Extraction cache directory (implies --cache unless --page-cache)")
+    parser.add_argument('--cache-max-mb', type=int, help="Evict least recently used cache entries past this size")
+    parser.add_argument('-w', '--workers', type=int, help="Worker processes (default: one per CPU)")
+    parser.add_argument('--page-workers', type=int,
+                        help="Processes used to extract page chunks of a single PDF in parallel")
+    parser.add_argument('--pages-per-chunk', type=int, help="Pages handed to each page worker at a time")
+    parser.add_argument('--metrics-jsonl', help="Append per-stage timings for every file to this JSON-lines file")
+    parser.add_argument('--prometheus', help="Write aggregated stage timings to this Prometheus text file")
+    parser.add_argument('--profile', metavar='PDF',
+                        help="Capture cProfile and tracemalloc output while converting this one file")
+    parser.add_argument('--resume', action='store_true',
+                        help="Skip files a previous run already converted, if neither they nor their outputs changed")
+    parser.add_argument('--journal', help="Journal file for --resume (default: a file in the output directory)")
+    parser.add_argument('--watch', action='store_true',
+                        help="Keep running and convert PDFs as they appear in the input directory")
+    parser.add_argument('--settle-seconds', type=float, default=2.0,
+                        help="With --watch, how long a file must stay unchanged before it is converted")
+    parser.add_argument('--queue-size', type=int, default=100,
+                        help="With --watch, most settled files waiting for a worker before intake pauses")
+    parser.add_argument('--poll', action='store_true',
+                        help="With --watch, poll the directory instead of using inotify (e.g. network shares)")
+    parser.add_argument('--settings', default=SETTINGS_FILE, help="Settings file to start from")
+    return parser
+
+
+def options_from_args(args):
+    options = load_options(args.settings)
+    if args.output_dir:
+        options.output_directory = args.output_dir
+    if args.method:
+        options.conversion_method = args.method
+    if args.password:
+        options.password = args.password
+    if args.pages:
+        options.extract_all_pages = False
+        options.page_range = args.pages
+    if args.single_table:
+        options.multiple_tables = False
+    if args.stitch:
+        options.stitch_tables = True
+    if args.infer_types:
+        options.infer_types = True
+    if args.no_format:
+        options.format_output = False
+    if args.metadata:
+        options.include_metadata = True
+    if args.format:
+        options.output_format = args.format
+    if args.streaming:
+        options.streaming_output = True
+    if args.memory_bounded:
+        options.memory_bounded = True
+    if args.max_worker_memory is not None:
+        options.max_worker_memory_mb = args.max_worker_memory
+    if args.width_sample_rows is not None:
+        options.width_sample_rows = args.width_sample_rows
+    if args.skip_table_free:
+        options.skip_table_free_pages = True
+    if args.min_aligned_rows is not None:
+        options.skip_min_aligned_rows = args.min_aligned_rows
+    if args.cache or (args.cache_dir and not args.page_cache):
+        options.use_cache = True
+    if args.page_cache:
+        options.use_page_cache = True
+    if args.cache_dir:
+        options.cache_directory = args.cache_dir
+    if args.cache_max_mb is not None:
+        options.cache_max_mb = args.cache_max_mb
+    if args.workers is not None:
+        options.workers = args.workers
+    if args.page_workers is not None:
+        options.page_workers = args.page_workers
+    if args.pages_per_chunk is not None:
+        options.pages_per_chunk = args.pages_per_chunk
+    if args.metrics_jsonl:
+        options.metrics_file = args.metrics_jsonl
+    if args.prometheus:
+        options.prometheus_file = args.prometheus
+    if args.profile:
+        options.profile_file = args.profile
+    if args.resume or args.journal:
+        options.resume = True
+    if args.journal:
+        options.journal_file = args.journal
+    return options
+
+
+def console_logger(message):
+    print(timestamped(message), flush=True)
+
+
+def cancel_on_interrupt(batch, log):
+    # The first Ctrl+C lets files in progress finish and keeps the journal consistent; a second one aborts
+    def handle(signum, frame):
+        if batch.cancel_event.is_set():
+            raise KeyboardInterrupt
+        batch.cancel()
+        log("Cancelling after the files in progress (press Ctrl+C again to abort)")
+    signal.signal(signal.SIGINT, handle)
+
+
+def watch(args, options):
+    if len(args.inputs) != 1 or not os.path.isdir(args.inputs[0]):
+        console_logger("--watch takes exactly one input directory")
+        return 2
+
+    events = EventChannel()
+    printer = threading.Thread(target=follow, args=(events,), daemon=True)
+    printer.start()
+    stop = threading.Event()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda signum, frame: stop.set())
+
+    watcher = FolderWatcher(args.inputs[0], options, logger=events.log, settle_seconds=args.settle_seconds,
+                            queue_size=args.queue_size, use_polling=args.poll)
+    try:
+        watcher.run(stop)
+    finally:
+        events.finish(None)
+        printer.join()
+    return 0
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    options = options_from_args(args)
+
+    if not options.output_directory:
+        parser.error("an output directory is required (--output-dir)")
+    os.makedirs(options.output_directory, exist_ok=True)
+    if args.watch:
+        return watch(args, options)
+
+    pdf_files = collect_pdf_files(args.inputs)
+    if not pdf_files:
+        console_logger("No PDF files found")
+        return 1
+
+    # The batch reports through the same event channel as the GUI; a printer thread drains it
+    events = EventChannel()
+    printer = threading.Thread(target=follow, args=(events,), daemon=True)
+    printer.start()
+    batch = BatchConverter(options, logger=events.log, progress_callback=events.progress)
+    cancel_on_interrupt(batch, events.log)
+    summary = None
+    try:
+        summary = batch.convert_files(pdf_files)
+    finally:
+        events.finish(summary)
+        printer.join()
+    if summary['cancelled']:
+        return 130
+    return 0 if not summary['fail'] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,775 @@
+"""GUI-independent conversion core shared by the desktop app and the CLI."""
+import os
+import json
+import time
+import signal
+import multiprocessing
+from multiprocessing.util import Finalize
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, asdict, fields, replace
+from datetime import datetime
+from extraction_cache import ExtractionCache, DEFAULT_CACHE_DIRECTORY
+from document_session import DocumentSession
+from tabula_backend import prepare_engine, tabula_usable
+from page_classifier import classify_page, engine_chain, has_table_structure
+from writers import OUTPUT_WRITERS, column_widths, apply_column_widths, named_tables, with_date_cells
+from metrics import StageTimer
+from memory_limits import release_memory
+
+EXTRACTION_METHODS = ('tabula', 'camelot', 'pdfplumber', 'auto')
+OUTPUT_FORMATS = tuple(OUTPUT_WRITERS)
+SETTINGS_FILE = 'pdf_converter_settings.json'
+
+
+@dataclass
+class ConversionOptions:
+    output_directory: str = ''
+    conversion_method: str = 'tabula'
+    password: str = ''
+    extract_all_pages: bool = True
+    page_range: str = '1-'
+    multiple_tables: bool = True
+    stitch_tables: bool = False
+    infer_types: bool = False
+    format_output: bool = True
+    include_metadata: bool = False
+    workers: int = 0
+    page_workers: int = 1
+    pages_per_chunk: int = 50
+    streaming_output: bool = False
+    memory_bounded: bool = False
+    max_worker_memory_mb: int = 0
+    output_format: str = 'xlsx'
+    width_sample_rows: int = 0
+    use_cache: bool = False
+    use_page_cache: bool = False
+    skip_table_free_pages: bool = False
+    skip_min_aligned_rows: int = 3
+    cache_directory: str = DEFAULT_CACHE_DIRECTORY
+    cache_max_mb: int = 1024
+    metrics_file: str = ''
+    prometheus_file: str = ''
+    profile_file: str = ''
+    resume: bool = False
+    journal_file: str = ''
+
+    @classmethod
+    def from_dict(cls, data):
+        known = {f.name for f in fields(cls)}
+        return cls(**{key: value for key, value in data.items() if key in known})
+
+    def to_settings(self):
+        # The password is never written to the settings file, nor the one-off profiling target
+        settings = asdict(self)
+        settings.pop('password')
+        settings.pop('profile_file')
+        return settings
+
+
+def load_options(path=SETTINGS_FILE):
+    if not os.path.exists(path):
+        return ConversionOptions()
+    with open(path, 'r') as f:
+        return ConversionOptions.from_dict(json.load(f))
+
+
+def save_options(options, path=SETTINGS_FILE):
+    with open(path, 'w') as f:
+        json.dump(options.to_settings(), f, indent=2)
+
+
+def chunk_pages(pages, pages_per_chunk):
+    size = max(1, pages_per_chunk)
+    return [pages[i:i + size] for i in range(0, len(pages), size)]
+
+
+def extract_page_chunk(pdf_file, options, pages):
+    # Runs inside a page worker; each worker opens its own handle on the PDF
+    messages = []
+    chunk_options = replace(options, extract_all_pages=False,
+                            page_range=','.join(str(p) for p in pages), page_workers=1,
+                            use_cache=False, use_page_cache=False, skip_table_free_pages=False)
+    converter = PDFConverter(chunk_options, logger=messages.append)
+    with converter.open_document(pdf_file):
+        return converter.extract_tables(pdf_file), messages, converter.timer.records
+
+
+def extract_page_tables_chunk(pdf_file, options, pages):
+    # Page-cache counterpart of extract_page_chunk that keeps tables keyed by page
+    messages = []
+    chunk_options = replace(options, page_workers=1, use_cache=False, use_page_cache=False,
+                            skip_table_free_pages=False)
+    converter = PDFConverter(chunk_options, logger=messages.append)
+    with converter.open_document(pdf_file):
+        return converter.extract_page_tables(pdf_file, pages), messages, converter.timer.records
+
+
+def prepare_worker(conversion_method):
+    # Pool initializer: Ctrl+C reaches the whole process group, and the parent
+    # decides whether that cancels the batch, so workers ignore it
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    preload_engine(conversion_method)
+    prepare_engine(conversion_method)
+
+
+def preload_engine(conversion_method):
+    # Extraction libraries are imported where they are first used, so starting the GUI or
+    # CLI never pays for engines it does not run; pool workers import theirs up front
+    import pandas  # noqa: F401
+    import PyPDF2  # noqa: F401
+    if conversion_method in ("pdfplumber", "auto"):
+        import pdfplumber  # noqa: F401
+    if conversion_method in ("camelot", "auto"):
+        import camelot  # noqa: F401
+    if conversion_method == "tabula" or (conversion_method == "auto" and tabula_usable()):
+        import tabula  # noqa: F401
+
+
+_page_pools = {}
+
+
+def page_pool(options):
+    # Page pools outlive a single file so their workers, and any tabula JVM they
+    # started, are reused for every large document this process converts
+    key = (options.page_workers, options.conversion_method)
+    if key not in _page_pools:
+        context = multiprocessing.get_context('spawn')
+        _page_pools[key] = ProcessPoolExecutor(max_workers=options.page_workers, mp_context=context,
+                                               initializer=prepare_worker,
+                                               initargs=(options.conversion_method,))
+    return _page_pools[key]
+
+
+def shutdown_page_pools():
+    for pool in _page_pools.values():
+        pool.shutdown()
+    _page_pools.clear()
+
+
+# Unlike atexit, multiprocessing finalizers also run when a pool worker process exits;
+# the high priority runs this before the finalizers that close the pools' own queues
+Finalize(None, shutdown_page_pools, exitpriority=100)
+
+
+def format_page_list(pages):
+    # [1, 2, 3, 7, 9, 10] -> "1-3, 7, 9-10"
+    ranges = []
+    for page_num in pages:
+        if ranges and page_num == ranges[-1][1] + 1:
+            ranges[-1][1] = page_num
+        else:
+            ranges.append([page_num, page_num])
+    return ", ".join(str(start) if start == end else f"{start}-{end}" for start, end in ranges)
+
+
+def timestamped(message):
+    return f"[{datetime.now().strftime('%H:%M:%S')}] {message}"
+
+
+class PDFConverter:
+    def __init__(self, options, logger=None):
+        self.options = options
+        self.logger = logger
+        self.cache = None
+        if options.use_cache or options.use_page_cache:
+            self.cache = ExtractionCache(options.cache_directory, options.cache_max_mb * 1024 * 1024)
+        self.cache_stats = {'hits': 0, 'misses': 0}
+        self.document = None
+        self.timer = StageTimer()
+        self.output_files = []
+
+    def log(self, message):
+        if self.logger:
+            self.logger(message)
+
+    def output_path(self, pdf_file):
+        base_name = os.path.splitext(os.path.basename(pdf_file))[0]
+        extension = OUTPUT_WRITERS[self.options.output_format].extension
+        return os.path.join(self.options.output_directory, f"{base_name}{extension}")
+
+    @contextmanager
+    def open_document(self, pdf_file):
+        with self.timer.stage('open'):
+            session = DocumentSession(pdf_file, self.options.password)
+        with session as document:
+            self.document = document
+            try:
+                yield document
+            finally:
+                self.document = None
+
+    @contextmanager
+    def document_for(self, pdf_file):
+        # The session opened by convert_single_file, or a short-lived one for direct calls
+        if self.document is not None and self.document.pdf_file == pdf_file:
+            yield self.document
+        else:
+            with DocumentSession(pdf_file, self.options.password) as document:
+                yield document
+
+    def convert_single_file(self, pdf_file):
+        try:
+            with self.open_document(pdf_file):
+                return self.convert_document(pdf_file)
+
+        except Exception as e:
+            self.log(f"Error in convert_single_file: {str(e)}")
+            return False
+
+    def convert_document(self, pdf_file):
+        output_file = self.output_path(pdf_file)
+
+        # Check if PDF is password protected
+        if self.is_password_protected(pdf_file):
+            if not self.options.password:
+                self.log(f"Password required for {os.path.basename(pdf_file)}")
+                return False
+
+        # Only the default openpyxl workbook is built in memory; every other writer streams
+        if self.options.streaming_output or self.options.memory_bounded or self.options.output_format != 'xlsx':
+            tables = self.cached_tables(pdf_file, self.iter_tables)
+            if self.options.stitch_tables:
+                tables = self.stitched_tables(tables, pdf_file)
+            if self.options.infer_types:
+                tables = self.typed_tables(tables)
+            table_count = self.save_streaming(tables, output_file, pdf_file)
+            if not table_count:
+                self.log(f"No tables found in {os.path.basename(pdf_file)}")
+                return False
+            return True
+
+        if self.options.page_workers > 1:
+            tables = list(self.cached_tables(pdf_file, self.extract_tables_parallel))
+        else:
+            tables = list(self.cached_tables(pdf_file, self.extract_tables))
+        if self.options.stitch_tables:
+            with self.timer.stage('stitch', fragments=len(tables)):
+                tables = list(self.stitched_tables(tables, pdf_file))
+        if self.options.infer_types:
+            tables = list(self.typed_tables(tables))
+
+        if not tables:
+            self.log(f"No tables found in {os.path.basename(pdf_file)}")
+            return False
+
+        # Save to Excel
+        self.save_to_excel(tables, output_file, pdf_file)
+        return True
+
+    def stitched_tables(self, tables, pdf_file):
+        # Applied after the cache, so cached entries stay raw and either setting can reuse them
+        from table_stitching import stitch_tables
+        stats = {}
+        yield from stitch_tables(tables, stats)
+        if stats.get('tables', 0) < stats.get('fragments', 0):
+            self.log(f"Stitched {stats['fragments']} table fragments of {os.path.basename(pdf_file)} "
+                     f"into {stats['tables']} table(s)")
+
+    def typed_tables(self, tables):
+        # Like stitching, applied after the cache so cached tables keep the extracted text
+        from type_inference import infer_types
+        for table in tables:
+            with self.timer.stage('infer_types', rows=len(table)):
+                table = infer_types(table)
+            yield table
+
+    def cached_tables(self, pdf_file, extract):
+        if self.options.use_page_cache:
+            return self.page_cached_tables(pdf_file, extract)
+        if not self.cache:
+            return extract(pdf_file)
+
+        with self.timer.stage('cache_lookup'):
+            with self.document_for(pdf_file) as document:
+                digest = document.digest()
+            key = self.cache.key(digest, self.options, self.get_page_range())
+            tables = self.cache.load(key)
+        if tables is not None:
+            self.cache_stats['hits'] += 1
+            self.log(f"Using cached extraction for {os.path.basename(pdf_file)}")
+            return tables
+
+        self.cache_stats['misses'] += 1
+        return self.cache.store(key, extract(pdf_file))
+
+    def page_cached_tables(self, pdf_file, extract):
+        # Only pages whose fingerprint has no cache entry are extracted; the rest are replayed
+        with self.timer.stage('cache_lookup'):
+            with self.document_for(pdf_file) as document:
+                fingerprints = document.page_fingerprints()
+            if fingerprints is not None:
+                pages = self.get_page_numbers(len(fingerprints))
+                keys = {page_num: self.cache.page_key(fingerprints[page_num - 1], self.options)
+                        for page_num in pages}
+                # touch() refreshes each hit, so eviction takes other documents' pages before these
+                missing = [page_num for page_num in pages if not self.cache.touch(keys[page_num])]
+        if fingerprints is None:
+            self.log(f"Page cache skipped for {os.path.basename(pdf_file)}: PyPDF2 cannot read its pages")
+            yield from extract(pdf_file)
+            return
+
+        self.cache_stats['hits'] += len(pages) - len(missing)
+        self.cache_stats['misses'] += len(missing)
+        self.log(f"Page cache: {len(pages) - len(missing)} of {len(pages)} pages reused, "
+                 f"{len(missing)} to extract for {os.path.basename(pdf_file)}")
+
+        extracted = self.extract_uncached_pages(pdf_file, missing, keys)
+        lost = [page_num for page_num in pages
+                if page_num not in extracted and not self.cache.touch(keys[page_num])]
+        if lost:
+            # Evicted by a concurrent worker since the lookup above
+            self.log(f"Page cache: {len(lost)} reused pages were evicted meanwhile; extracting them")
+            self.cache_stats['hits'] -= len(lost)
+            self.cache_stats['misses'] += len(lost)
+            extracted.update(self.extract_uncached_pages(pdf_file, lost, keys))
+
+        try:
+            for page_num in pages:
+                if page_num in extracted:
+                    yield from extracted[page_num]
+                    continue
+                tables = self.cache.load(keys[page_num])
+                if tables is None:
+                    # Lost in the moment since the check above; extracted and cached again
+                    tables = self.extract_uncached_pages(pdf_file, [page_num], keys)[page_num]
+                    extracted[page_num] = tables
+                yield from tables
+        finally:
+            # Only after the replay, so this document's own entries are never the ones evicted
+            if extracted:
+                self.cache.evict()
+
+    def extract_uncached_pages(self, pdf_file, pages, keys):
+        candidates = pages
+        if pages and self.options.skip_table_free_pages:
+            candidates = self.table_candidate_pages(pdf_file, pages)
+        extracted = self.extract_missing_pages(pdf_file, candidates) if candidates else {}
+        for page_num in pages:
+            # Pages the pre-filter ruled out are cached as pages without tables
+            extracted.setdefault(page_num, [])
+        for page_num, tables in extracted.items():
+            self.cache.put(keys[page_num], tables, evict=False)
+        return extracted
+
+    def extract_missing_pages(self, pdf_file, pages):
+        chunks = chunk_pages(pages, self.options.pages_per_chunk)
+        if self.options.page_workers < 2 or len(chunks) < 2:
+            return self.extract_page_tables(pdf_file, pages)
+
+        page_tables = {}
+        results = page_pool(self.options).map(extract_page_tables_chunk, [pdf_file] * len(chunks),
+                                              [self.options] * len(chunks), chunks)
+        for chunk_tables, messages, timings in results:
+            for message in messages:
+                self.log(message)
+            self.timer.extend(timings)
+            page_tables.update(chunk_tables)
+        return page_tables
+
+    def extract_page_tables(self, pdf_file, pages):
+        # Tables keyed by page number so each page can be cached on its own
+        password = self.options.password or None
+        page_tables = {page_num: [] for page_num in pages}
+
+        if self.options.conversion_method == "auto":
+            return self.auto_page_tables(pdf_file, pages)
+        elif self.options.conversion_method == "tabula":
+            import tabula
+            for page_num in pages:
+                with self.timer.stage('extract_page', engine='tabula', page=page_num):
+                    tables = tabula.read_pdf(pdf_file, pages=page_num, multiple_tables=self.options.multiple_tables,
+                                             password=password)
+                page_tables[page_num] = [table for table in tables if not table.empty]
+        elif self.options.conversion_method == "camelot":
+            import camelot
+            pages_arg = ','.join(str(page_num) for page_num in pages)
+            with self.timer.stage('extract', engine='camelot', pages=len(pages)):
+                tables = camelot.read_pdf(pdf_file, pages=pages_arg, password=self.options.password)
+            for table in tables:
+                page_tables[int(table.page)].append(table.df)
+        else:
+            with self.document_for(pdf_file) as document:
+                pdf = document.plumber()
+                for page_num in pages:
+                    page_tables[page_num] = self.pdfplumber_page_tables(pdf.pages[page_num - 1])
+                    self.release_page(pdf.pages[page_num - 1])
+
+        return page_tables
+
+    def auto_page_tables(self, pdf_file, pages):
+        # Each page starts on the cheapest engine its profile suggests; pages that
+        # come back empty move on to the next engine in their chain
+        with self.document_for(pdf_file) as document:
+            pdf = document.plumber()
+            with self.timer.stage('classify', pages=len(pages)):
+                profiles = {}
+                for page_num in pages:
+                    profiles[page_num] = classify_page(pdf.pages[page_num - 1], page_num)
+                    self.release_page(pdf.pages[page_num - 1])
+
+        usable = tabula_usable()
+        chains = {page_num: engine_chain(profiles[page_num], usable) for page_num in pages}
+        page_tables = {page_num: [] for page_num in pages}
+
+        while True:
+            by_engine = {}
+            for page_num, chain in chains.items():
+                if chain:
+                    by_engine.setdefault(chain[0], []).append(page_num)
+            if not by_engine:
+                break
+
+            for engine, engine_pages in by_engine.items():
+                start = time.perf_counter()
+                try:
+                    results = self.engine_converter(engine).extract_page_tables(pdf_file, engine_pages)
+                except Exception as e:
+                    self.log(f"Auto: {engine} failed on pages {engine_pages[0]}-{engine_pages[-1]}: {str(e)}")
+                    results = {}
+                per_page = (time.perf_counter() - start) / len(engine_pages)
+
+                for page_num in engine_pages:
+                    tables = results.get(page_num, [])
+                    profiles[page_num].attempts.append((engine, per_page, len(tables)))
+                    if tables:
+                        page_tables[page_num] = tables
+                        chains[page_num] = []
+                    else:
+                        chains[page_num] = chains[page_num][1:]
+
+        for page_num in pages:
+            self.log_routing(profiles[page_num])
+        return page_tables
+
+    def engine_converter(self, engine):
+        converter = PDFConverter(replace(self.options, conversion_method=engine, use_cache=False,
+                                         use_page_cache=False, skip_table_free_pages=False),
+                                 logger=self.logger)
+        # Share the open session so pdfplumber reuses the pages the pre-scan parsed
+        converter.document = self.document
+        converter.timer = self.timer
+        return converter
+
+    def log_routing(self, profile):
+        if not profile.attempts:
+            route = "no text layer, skipped"
+        else:
+            route = ", ".join(f"{engine} {seconds * 1000:.0f} ms -> {count} table(s)"
+                              for engine, seconds, count in profile.attempts)
+        self.log(f"Page {profile.page_number}: {profile.describe()}; scan {profile.scan_seconds * 1000:.0f} ms; {route}")
+
+    def extract_tables(self, pdf_file):
+        # Extract tables based on selected method
+        if self.options.conversion_method == "tabula":
+            return self.extract_with_tabula(pdf_file)
+        elif self.options.conversion_method == "camelot":
+            return self.extract_with_camelot(pdf_file)
+        elif self.options.conversion_method == "auto":
+            return self.extract_with_auto(pdf_file)
+        else:
+            return self.extract_with_pdfplumber(pdf_file)
+
+    def iter_tables(self, pdf_file):
+        # Yields tables as they are extracted so streaming output never holds the full set
+        if self.options.page_workers > 1:
+            return self.iter_tables_parallel(pdf_file)
+        return self.iter_tables_sequential(pdf_file)
+
+    def iter_tables_sequential(self, pdf_file):
+        if self.options.conversion_method in ("tabula", "camelot", "auto"):
+            if self.options.memory_bounded:
+                return self.iter_tables_chunked(pdf_file)
+            # These engines hand back every table from a single call
+            return iter(self.extract_tables(pdf_file))
+        return self.iter_pdfplumber_tables(pdf_file)
+
+    def iter_tables_chunked(self, pdf_file):
+        # Memory-bounded mode: engines that extract a whole range per call get one chunk
+        # of pages at a time, so only that chunk's tables are held before they are written
+        pages = self.extraction_pages(pdf_file)
+        for pages_chunk in chunk_pages(pages, self.options.pages_per_chunk):
+            yield from self.chunk_converter(pages_chunk).extract_tables(pdf_file)
+            release_memory()
+
+    def chunk_converter(self, pages):
+        converter = PDFConverter(replace(self.options, extract_all_pages=False,
+                                         page_range=','.join(str(p) for p in pages), use_cache=False,
+                                         use_page_cache=False, skip_table_free_pages=False),
+                                 logger=self.logger)
+        converter.document = self.document
+        converter.timer = self.timer
+        return converter
+
+    def extract_tables_parallel(self, pdf_file):
+        return list(self.iter_tables_parallel(pdf_file))
+
+    def iter_tables_parallel(self, pdf_file):
+        pages = self.extraction_pages(pdf_file)
+        chunks = chunk_pages(pages, self.options.pages_per_chunk)
+        if len(chunks) < 2:
+            yield from self.iter_tables_sequential(pdf_file)
+            return
+
+        workers = min(self.options.page_workers, len(chunks))
+        self.log(f"Extracting {len(pages)} pages of {os.path.basename(pdf_file)} "
+                 f"in {len(chunks)} chunks with {workers} page worker(s)")
+
+        # map() yields chunk results in submission order, so tables stay in page order
+        results = page_pool(self.options).map(extract_page_chunk, [pdf_file] * len(chunks),
+                                              [self.options] * len(chunks), chunks)
+        for chunk_tables, messages, timings in results:
+            for message in messages:
+                self.log(message)
+            self.timer.extend(timings)
+            yield from chunk_tables
+
+    def is_password_protected(self, pdf_file):
+        try:
+            with self.document_for(pdf_file) as document:
+                return document.is_encrypted
+        except Exception:
+            return False
+
+    def extract_with_tabula(self, pdf_file):
+        try:
+            import tabula
+            password = self.options.password or None
+            pages = self.extraction_page_range(pdf_file)
+            if not pages:
+                return []
+
+            with self.timer.stage('extract', engine='tabula'):
+                if self.options.multiple_tables:
+                    tables = tabula.read_pdf(pdf_file, pages=pages, multiple_tables=True, password=password)
+                else:
+                    tables = [tabula.read_pdf(pdf_file, pages=pages, password=password)]
+
+            return [table for table in tables if not table.empty]
+
+        except Exception as e:
+            self.log(f"Tabula extraction error: {str(e)}")
+            return []
+
+    def extract_with_camelot(self, pdf_file):
+        try:
+            import camelot
+            pages = self.extraction_page_range(pdf_file)
+            if not pages:
+                return []
+            with self.timer.stage('extract', engine='camelot'):
+                tables = camelot.read_pdf(pdf_file, pages=pages, password=self.options.password)
+            with self.timer.stage('dataframe'):
+                return [table.df for table in tables]
+
+        except Exception as e:
+            self.log(f"Camelot extraction error: {str(e)}")
+            return []
+
+    def extract_with_auto(self, pdf_file):
+        try:
+            with self.document_for(pdf_file):
+                pages = self.extraction_pages(pdf_file)
+                page_tables = self.auto_page_tables(pdf_file, pages)
+            return [table for page_num in pages for table in page_tables[page_num]]
+
+        except Exception as e:
+            self.log(f"Auto extraction error: {str(e)}")
+            return []
+
+    def extract_with_pdfplumber(self, pdf_file):
+        try:
+            return list(self.iter_pdfplumber_tables(pdf_file))
+
+        except Exception as e:
+            self.log(f"PDFPlumber extraction error: {str(e)}")
+            return []
+
+    def iter_pdfplumber_tables(self, pdf_file):
+        with self.document_for(pdf_file) as document:
+            pdf = document.plumber()
+            pages = self.extraction_pages(pdf_file)
+
+            for page_num in pages:
+                page = pdf.pages[page_num - 1]
+                tables = self.pdfplumber_page_tables(page)
+                self.release_page(page)
+                yield from tables
+
+    def pdfplumber_page_tables(self, page):
+        import pandas as pd
+        with self.timer.stage('extract_page', engine='pdfplumber', page=page.page_number):
+            tables = page.extract_tables()
+        with self.timer.stage('dataframe', page=page.page_number):
+            return [pd.DataFrame(table[1:], columns=table[0]) for table in tables if table]
+
+    def release_page(self, page):
+        # pdfplumber keeps every parsed page's characters and layout until the document
+        # closes; memory-bounded mode drops them as soon as the page has been read
+        if self.options.memory_bounded:
+            page.close()
+
+    def extraction_pages(self, pdf_file):
+        # The requested pages, minus any the table pre-filter rules out
+        with self.timer.stage('page_range'), self.document_for(pdf_file) as document:
+            pages = self.get_page_numbers(document.page_count)
+        if self.options.skip_table_free_pages:
+            pages = self.table_candidate_pages(pdf_file, pages)
+        return pages
+
+    def extraction_page_range(self, pdf_file):
+        # extraction_pages in the page-range form tabula and camelot accept
+        if not self.options.skip_table_free_pages:
+            return self.get_page_range()
+        return ','.join(str(page_num) for page_num in self.extraction_pages(pdf_file))
+
+    def table_candidate_pages(self, pdf_file, pages):
+        with self.timer.stage('page_filter', pages=len(pages)), self.document_for(pdf_file) as document:
+            pdf = document.plumber()
+            kept = []
+            for page_num in pages:
+                if has_table_structure(pdf.pages[page_num - 1], self.options.skip_min_aligned_rows):
+                    kept.append(page_num)
+                self.release_page(pdf.pages[page_num - 1])
+
+        skipped = sorted(set(pages) - set(kept))
+        message = (f"Table pre-filter: analysing {len(kept)} of {len(pages)} pages of "
+                   f"{os.path.basename(pdf_file)}, skipped {len(skipped)}")
+        if skipped:
+            message += f" ({format_page_list(skipped)})"
+        self.log(message)
+        return kept
+
+    def get_page_range(self):
+        if self.options.extract_all_pages:
+            return 'all'
+        else:
+            return self.options.page_range
+
+    def get_page_numbers(self, total_pages):
+        if self.options.extract_all_pages:
+            return list(range(1, total_pages + 1))
+
+        page_range = self.options.page_range
+        pages = []
+
+        try:
+            if '-' in page_range:
+                start, end = page_range.split('-')
+                start = int(start) if start else 1
+                end = int(end) if end else total_pages
+                pages = list(range(start, min(end + 1, total_pages + 1)))
+            elif ',' in page_range:
+                pages = [int(p.strip()) for p in page_range.split(',')]
+                pages = [p for p in pages if 1 <= p <= total_pages]
+            else:
+                page_num = int(page_range)
+                if 1 <= page_num <= total_pages:
+                    pages = [page_num]
+
+        except ValueError:
+            self.log(f"Invalid page range: {page_range}")
+            pages = [1]
+
+        return pages
+
+    def save_to_excel(self, tables, output_file, pdf_file):
+        import pandas as pd
+        try:
+            with pd.ExcelWriter(output_file, engine='openpyxl') as writer:
+                for i, table in enumerate(tables):
+                    sheet_name = f"Table_{i+1}" if len(tables) > 1 else "Data"
+                    with self.timer.stage('write', sheet=sheet_name, rows=len(table)):
+                        with_date_cells(table).to_excel(writer, sheet_name=sheet_name, index=False)
+
+                    if self.options.format_output:
+                        with self.timer.stage('format', sheet=sheet_name):
+                            self.format_excel_sheet(writer, sheet_name, table)
+
+                # Add metadata sheet if requested
+                if self.options.include_metadata:
+                    with self.timer.stage('metadata'):
+                        self.add_metadata_sheet(writer, pdf_file, len(tables))
+
+                # The workbook is serialised when the writer closes
+                save_started = time.perf_counter()
+            self.timer.add('save', time.perf_counter() - save_started)
+            self.output_files = [output_file]
+
+        except Exception as e:
+            self.log(f"Excel save error: {str(e)}")
+            raise
+
+    def format_excel_sheet(self, writer, sheet_name, table):
+        from openpyxl.styles import Font, PatternFill, Alignment
+        try:
+            worksheet = writer.sheets[sheet_name]
+
+            # Header formatting
+            header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+            header_font = Font(color="FFFFFF", bold=True)
+
+            for col_num, column_title in enumerate(table.columns, 1):
+                cell = worksheet.cell(row=1, column=col_num)
+                cell.fill = header_fill
+                cell.font = header_font
+                cell.alignment = Alignment(horizontal="center")
+
+            # Auto-adjust column widths from the DataFrame rather than the written cells
+            apply_column_widths(worksheet, column_widths(table, self.options.width_sample_rows))
+
+        except Exception as e:
+            self.log(f"Formatting error: {str(e)}")
+
+    def save_streaming(self, tables, output_file, pdf_file):
+        writer_class = OUTPUT_WRITERS[self.options.output_format]
+        writer = writer_class(output_file, format_output=self.options.format_output,
+                              sample_rows=self.options.width_sample_rows)
+        table_count = 0
+        for sheet_name, table in named_tables(tables):
+            table_count += 1
+            with self.timer.stage('write', sheet=sheet_name, rows=len(table)):
+                writer.write_dataframe(sheet_name, table)
+
+        if not table_count:
+            return 0
+
+        if self.options.include_metadata:
+            try:
+                with self.timer.stage('metadata'):
+                    writer.write_dataframe("Metadata", self.metadata_table(pdf_file, table_count), styled=False)
+            except Exception as e:
+                self.log(f"Metadata error: {str(e)}")
+
+        try:
+            with self.timer.stage('save'):
+                writer.save()
+        except Exception as e:
+            self.log(f"Save error: {str(e)}")
+            raise
+        self.output_files = writer.files
+        return table_count
+
+    def metadata_table(self, pdf_file, table_count):
+        import pandas as pd
+        metadata = {
+            'Source PDF': [os.path.basename(pdf_file)],
+            'Conversion Date': [datetime.now().strftime("%Y-%m-%d %H:%M:%S")],
+            'Extraction Method': [self.options.conversion_method],
+            'Tables Found': [table_count],
+            'File Size': [f"{self.file_size(pdf_file) / 1024:.2f} KB"]
+        }
+        return pd.DataFrame(metadata)
+
+    def file_size(self, pdf_file):
+        if self.document is not None and self.document.pdf_file == pdf_file:
+            return self.document.file_size
+        return os.path.getsize(pdf_file)
+
+    def add_metadata_sheet(self, writer, pdf_file, table_count):
+        try:
+            metadata_df = self.metadata_table(pdf_file, table_count)
+            metadata_df.to_excel(writer, sheet_name="Metadata", index=False)
+
+        except Exception as e:
+            self.log(f"Metadata error: {str(e)}")
@@ -0,0 +1,74 @@
+"""A PDF opened once and shared by every step of a single file's conversion."""
+import os
+from extraction_cache import file_digest, page_fingerprints
+
+
+class DocumentSession:
+    """Parses and decrypts a PDF once for the password check, page-range
+    resolution, caching, extraction and metadata steps.
+
+    The PyPDF2 reader is created up front; the pdfplumber document is only
+    parsed if a pdfplumber extraction asks for it, and then reused for every
+    page. Tabula and camelot read the file themselves and are not covered.
+    """
+
+    def __init__(self, pdf_file, password=''):
+        import PyPDF2
+
+        self.pdf_file = pdf_file
+        self.password = password or ''
+        self.file_size = os.path.getsize(pdf_file)
+        self._plumber = None
+        self._digest = None
+        self._fingerprints = None
+
+        self.reader = None
+        self.is_encrypted = False
+        self._file = open(pdf_file, 'rb')
+        try:
+            self.reader = PyPDF2.PdfReader(self._file)
+            self.is_encrypted = self.reader.is_encrypted
+            if self.is_encrypted and self.password:
+                self.reader.decrypt(self.password)
+        except Exception:
+            # Matches the old password check: unreadable by PyPDF2 counts as unencrypted
+            self.reader = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def pages(self):
+        if self.reader is not None:
+            return self.reader.pages
+        return self.plumber().pages
+
+    @property
+    def page_count(self):
+        return len(self.pages)
+
+    def plumber(self):
+        if self._plumber is None:
+            import pdfplumber
+            self._plumber = pdfplumber.open(self.pdf_file, password=self.password or None)
+        return self._plumber
+
+    def digest(self):
+        if self._digest is None:
+            self._digest = file_digest(self.pdf_file)
+        return self._digest
+
+    def page_fingerprints(self):
+        # None when PyPDF2 could not read the file; such files bypass the page cache
+        if self._fingerprints is None and self.reader is not None:
+            self._fingerprints = page_fingerprints(self.reader.pages, self.digest)
+        return self._fingerprints
+
+    def close(self):
+        if self._plumber is not None:
+            self._plumber.close()
+            self._plumber = None
+        self._file.close()
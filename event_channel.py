@@ -0,0 +1,76 @@
+"""Thread-safe channel carrying log lines and progress from conversion threads to a front end."""
+import sys
+import queue
+from converter_core import timestamped
+
+# Most events taken per drain, so one flush never stalls the consumer for long
+DRAIN_LIMIT = 5000
+
+
+class EventChannel:
+    """Producers call ``log``/``progress``/``status``/``finish`` from any thread.
+
+    Consumers call :meth:`drain` on their own schedule and get every log line
+    in order, but only the latest progress, status and finish values, so a
+    burst of updates costs the consumer one redraw instead of one per event.
+    Log lines are timestamped when they are produced, not when they are shown.
+    """
+
+    def __init__(self):
+        self._events = queue.SimpleQueue()
+
+    def log(self, message):
+        self._events.put(('log', timestamped(message)))
+
+    def progress(self, done, total):
+        self._events.put(('progress', (done, total)))
+
+    def status(self, text):
+        self._events.put(('status', text))
+
+    def finish(self, summary):
+        self._events.put(('finish', summary))
+
+    def drain(self, timeout=None, limit=DRAIN_LIMIT):
+        """Return ``(lines, latest)`` for the pending events; ``latest`` maps kind to last value.
+
+        With a timeout, waits up to that many seconds for the first event.
+        """
+        lines = []
+        latest = {}
+        try:
+            events = [self._events.get(timeout=timeout) if timeout else self._events.get_nowait()]
+        except queue.Empty:
+            return lines, latest
+        while len(events) < limit:
+            try:
+                events.append(self._events.get_nowait())
+            except queue.Empty:
+                break
+
+        for kind, payload in events:
+            if kind == 'log':
+                lines.append(payload)
+            else:
+                latest[kind] = payload
+        return lines, latest
+
+
+def follow(channel, stream=None, interval=0.2):
+    """Print a channel's events to a console until it finishes; returns the finish value."""
+    stream = stream or sys.stdout
+    last_progress = None
+    while True:
+        lines, latest = channel.drain(timeout=interval)
+        for line in lines:
+            print(line, file=stream)
+        progress = latest.get('progress')
+        if progress and progress != last_progress:
+            done, total = progress
+            print(timestamped(f"Progress: {done}/{total} files ({done / total:.0%})"), file=stream)
+            last_progress = progress
+        if 'status' in latest:
+            print(timestamped(latest['status']), file=stream)
+        stream.flush()
+        if 'finish' in latest:
+            return latest['finish']
@@ -0,0 +1,187 @@
+"""On-disk, content-addressed cache of extracted tables with size-based LRU eviction."""
+import os
+import json
+import pickle
+import hashlib
+import tempfile
+
+DEFAULT_CACHE_DIRECTORY = os.path.join(os.path.expanduser('~'), '.pdf_to_excel_cache')
+ENTRY_SUFFIX = '.pkl'
+
+
+def file_digest(path, chunk_size=1024 * 1024):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def page_fingerprints(pages, document_digest=None):
+    """Digest of every page's content stream, resources and geometry, in page order.
+
+    Unlike the whole-file digest these stay stable when pages are appended
+    to a document, so cumulative files keep hitting on their older pages.
+    Resources are hashed with everything they reference, so a page drawing
+    its table through a form XObject or a font differs from one that only
+    shares its content stream. A page whose resources cannot be walked is
+    tied to ``document_digest()`` instead, and only hits within that file.
+    """
+    fingerprints = []
+    digests = {}
+    for page in pages:
+        digest = hashlib.sha256()
+        contents = page.get_contents()
+        if contents is not None:
+            digest.update(contents.get_data())
+        try:
+            digest.update(object_digest(page.get('/Resources'), digests, set()))
+        except Exception:
+            if document_digest is None:
+                raise
+            digest.update(document_digest().encode())
+        digest.update(f"{list(page.mediabox)}:{page.rotation}".encode())
+        fingerprints.append(digest.hexdigest())
+    return fingerprints
+
+
+def object_digest(obj, digests, visiting):
+    # Indirect objects are hashed once per document; ``visiting`` stops reference cycles
+    from PyPDF2.generic import ArrayObject, DictionaryObject, IndirectObject, StreamObject
+
+    if isinstance(obj, IndirectObject):
+        reference = (obj.idnum, obj.generation)
+        if reference not in digests:
+            if reference in visiting:
+                return f"cycle:{reference}".encode()
+            visiting.add(reference)
+            digests[reference] = object_digest(obj.get_object(), digests, visiting)
+            visiting.discard(reference)
+        return digests[reference]
+
+    digest = hashlib.sha256()
+    if isinstance(obj, DictionaryObject):
+        for name in sorted(obj):
+            # /Parent points back up the page tree, which would pull in every page
+            if name != '/Parent':
+                digest.update(name.encode() + object_digest(obj.raw_get(name), digests, visiting))
+        if isinstance(obj, StreamObject):
+            digest.update(obj.get_data())
+    elif isinstance(obj, ArrayObject):
+        for item in obj:
+            digest.update(b'[' + object_digest(item, digests, visiting))
+    else:
+        digest.update(repr(obj).encode())
+    return digest.digest()
+
+
+def skip_setting(options):
+    # The table pre-filter changes which pages produce tables, so it is part of every key
+    return options.skip_min_aligned_rows if options.skip_table_free_pages else None
+
+
+class ExtractionCache:
+    """Maps (PDF content, extraction settings) to the tables they produced.
+
+    Each entry is a file of consecutively pickled DataFrames, so hits can be
+    streamed back table by table and misses recorded as tables pass through.
+    Reading an entry refreshes its mtime; when the directory grows past
+    ``max_bytes`` the least recently used entries are removed first.
+    """
+
+    def __init__(self, directory=DEFAULT_CACHE_DIRECTORY, max_bytes=1024 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def key(self, digest, options, page_range):
+        settings = {
+            'digest': digest,
+            'method': options.conversion_method,
+            'pages': page_range,
+            'multiple_tables': options.multiple_tables,
+            'skip': skip_setting(options),
+        }
+        return hashlib.sha256(json.dumps(settings, sort_keys=True).encode()).hexdigest()
+
+    def page_key(self, fingerprint, options):
+        settings = {
+            'page': fingerprint,
+            'method': options.conversion_method,
+            'multiple_tables': options.multiple_tables,
+            'skip': skip_setting(options),
+        }
+        return hashlib.sha256(json.dumps(settings, sort_keys=True).encode()).hexdigest()
+
+    def entry_path(self, key):
+        return os.path.join(self.directory, key + ENTRY_SUFFIX)
+
+    def touch(self, key):
+        # Whether the entry exists; a hit is marked as just used so eviction keeps it
+        try:
+            os.utime(self.entry_path(key))
+        except FileNotFoundError:
+            return False
+        return True
+
+    def load(self, key):
+        if not self.touch(key):
+            return None
+        return self.read_entry(self.entry_path(key))
+
+    def read_entry(self, path):
+        with open(path, 'rb') as file:
+            while True:
+                try:
+                    yield pickle.load(file)
+                except EOFError:
+                    return
+
+    def store(self, key, tables):
+        # Pass tables through while writing them; the entry only appears once every
+        # table has been written, so an interrupted extraction never leaves a partial hit
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        stored = 0
+        try:
+            with os.fdopen(fd, 'wb') as file:
+                for table in tables:
+                    pickle.dump(table, file, protocol=pickle.HIGHEST_PROTOCOL)
+                    stored += 1
+                    yield table
+            if stored:
+                os.replace(temp_path, self.entry_path(key))
+                self.evict()
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def put(self, key, tables, evict=True):
+        # Unlike store(), an empty table list is a valid entry: it records a page without tables
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as file:
+            for table in tables:
+                pickle.dump(table, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, self.entry_path(key))
+        if evict:
+            self.evict()
+
+    def evict(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(ENTRY_SUFFIX):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, name))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                pass
+            total -= size
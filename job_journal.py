@@ -0,0 +1,114 @@
+"""SQLite journal of finished conversions, so interrupted batches resume where they stopped."""
+import os
+import json
+import time
+import hashlib
+import sqlite3
+from dataclasses import asdict
+from extraction_cache import file_digest
+
+JOURNAL_FILE = '.pdf_to_excel_journal.sqlite'
+
+# Options that change how a batch runs but not what it writes
+RUNTIME_OPTIONS = ('password', 'workers', 'page_workers', 'pages_per_chunk', 'use_cache', 'use_page_cache',
+                   'cache_directory', 'cache_max_mb', 'streaming_output', 'memory_bounded', 'max_worker_memory_mb',
+                   'metrics_file', 'prometheus_file', 'profile_file', 'resume', 'journal_file')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    settings TEXT NOT NULL,
+    source_digest TEXT,
+    source_size INTEGER,
+    source_mtime_ns INTEGER,
+    output_file TEXT,
+    output_size INTEGER,
+    output_mtime_ns INTEGER,
+    finished REAL
+)
+"""
+
+
+def output_settings_key(options):
+    settings = asdict(options)
+    for name in RUNTIME_OPTIONS:
+        settings.pop(name, None)
+    return hashlib.sha256(json.dumps(settings, sort_keys=True).encode()).hexdigest()
+
+
+def source_state(pdf_file):
+    # Taken before conversion, so a file rewritten mid-run is converted again next time
+    stat = os.stat(pdf_file)
+    return {
+        'digest': file_digest(pdf_file),
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+    }
+
+
+class JobJournal:
+    """Per-file status, source content hash and output file of every conversion in a directory.
+
+    A file counts as complete when its last conversion succeeded with the same
+    output settings, the source still has the recorded content and the output
+    is still the file that conversion wrote. Sources whose size and mtime are
+    unchanged are not re-hashed.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute(SCHEMA)
+        self.connection.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def is_complete(self, pdf_file, settings_key):
+        row = self.connection.execute(
+            "SELECT status, settings, source_digest, source_size, source_mtime_ns, output_file, output_size, "
+            "output_mtime_ns FROM files WHERE path = ?", (os.path.abspath(pdf_file),)).fetchone()
+        if row is None:
+            return False
+        status, settings, digest, size, mtime_ns, output_file, output_size, output_mtime_ns = row
+        if status != 'done' or settings != settings_key or not output_file:
+            return False
+
+        try:
+            output = os.stat(output_file)
+            source = os.stat(pdf_file)
+        except OSError:
+            return False
+        if (output.st_size, output.st_mtime_ns) != (output_size, output_mtime_ns):
+            return False
+        if (source.st_size, source.st_mtime_ns) == (size, mtime_ns):
+            return True
+
+        # Touched or copied but possibly identical: fall back to the content hash
+        if source.st_size != size or file_digest(pdf_file) != digest:
+            return False
+        self.connection.execute("UPDATE files SET source_mtime_ns = ? WHERE path = ?",
+                                (source.st_mtime_ns, os.path.abspath(pdf_file)))
+        self.connection.commit()
+        return True
+
+    def record(self, result, settings_key):
+        source = result.get('source') or {}
+        output_size = output_mtime_ns = None
+        if result['success'] and result['output_file'] and os.path.exists(result['output_file']):
+            output = os.stat(result['output_file'])
+            output_size, output_mtime_ns = output.st_size, output.st_mtime_ns
+        self.connection.execute(
+            "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (os.path.abspath(result['file']), 'done' if output_size is not None else 'failed', settings_key,
+             source.get('digest'), source.get('size'), source.get('mtime_ns'),
+             result['output_file'], output_size, output_mtime_ns, time.time()))
+        self.connection.commit()
+
+    def close(self):
+        self.connection.close()
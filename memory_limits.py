@@ -0,0 +1,75 @@
+"""Resident memory of the current process: reading it, its per-file peak and giving freed memory back.
+
+On Linux everything comes from /proc, and the peak can be reset between
+files. Elsewhere the current size needs ``psutil`` and the peak is the
+process lifetime maximum from ``getrusage``.
+"""
+import os
+import gc
+import sys
+import ctypes
+import ctypes.util
+
+MB = 1024 * 1024
+PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+
+def current_rss():
+    """Resident set size in bytes, or None if it cannot be read here."""
+    try:
+        with open('/proc/self/statm') as file:
+            return int(file.read().split()[1]) * PAGE_SIZE
+    except OSError:
+        pass
+    try:
+        import psutil
+    except ImportError:
+        return None
+    return psutil.Process().memory_info().rss
+
+
+def reset_peak():
+    # Writing 5 to clear_refs resets VmHWM (Linux 4.0+), so each file gets its own peak
+    try:
+        with open('/proc/self/clear_refs', 'w') as file:
+            file.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def peak_rss():
+    """Peak resident set size in bytes since the last reset_peak, or the process start."""
+    try:
+        with open('/proc/self/status') as file:
+            for line in file:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        import resource
+    except ImportError:
+        return current_rss()
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def load_malloc_trim():
+    if not sys.platform.startswith('linux'):
+        return None
+    try:
+        return ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6').malloc_trim
+    except (OSError, AttributeError):
+        return None
+
+
+MALLOC_TRIM = load_malloc_trim()
+
+
+def release_memory():
+    # Collect cycles, then ask glibc to hand free heap pages back so RSS actually drops
+    gc.collect()
+    if MALLOC_TRIM is not None:
+        MALLOC_TRIM(0)
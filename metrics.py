@@ -0,0 +1,140 @@
+"""Per-stage conversion timings, their JSON-lines and Prometheus outputs, and single-file profiling."""
+import os
+import json
+import time
+import cProfile
+import tempfile
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+
+# Upper bounds, in seconds, of the per-file conversion time histogram
+FILE_SECONDS_BUCKETS = (0.5, 1, 2, 5, 10, 30, 60, 120, 300, 600)
+PROFILE_TOP_LINES = 25
+
+
+class StageTimer:
+    """Timings for the stages of one file's conversion.
+
+    Records are plain dicts so they can travel back from worker processes with
+    the rest of a file's result; the batch stamps the file name on them.
+    """
+
+    def __init__(self):
+        self.records = []
+
+    @contextmanager
+    def stage(self, name, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start, **labels)
+
+    def add(self, name, seconds, **labels):
+        self.records.append({'stage': name, 'seconds': seconds, 'ended': time.time(), **labels})
+
+    def extend(self, records):
+        self.records.extend(records)
+
+
+class MetricsRecorder:
+    """Appends stage records as JSON lines and aggregates them for a Prometheus text file."""
+
+    def __init__(self, jsonl_path='', prometheus_path=''):
+        self.jsonl_path = jsonl_path
+        self.prometheus_path = prometheus_path
+        self.stages = {}
+        self.files = {'success': 0, 'fail': 0}
+        self.file_seconds = []
+        self.peak_rss_mb = 0.0
+
+    def record_file(self, pdf_file, success, records):
+        for record in records:
+            stats = self.stages.setdefault(record['stage'], {'count': 0, 'sum': 0.0, 'max': 0.0})
+            stats['count'] += 1
+            stats['sum'] += record['seconds']
+            stats['max'] = max(stats['max'], record['seconds'])
+            if record['stage'] == 'convert':
+                self.file_seconds.append(record['seconds'])
+                self.peak_rss_mb = max(self.peak_rss_mb, record.get('peak_rss_mb', 0.0))
+        self.files['success' if success else 'fail'] += 1
+
+        if self.jsonl_path and records:
+            with open(self.jsonl_path, 'a', encoding='utf-8') as file:
+                for record in records:
+                    line = dict(record, file=pdf_file, seconds=round(record['seconds'], 6),
+                                ended=datetime.fromtimestamp(record['ended']).isoformat(timespec='milliseconds'))
+                    file.write(json.dumps(line) + '\n')
+
+    def prometheus_text(self):
+        lines = [
+            "# HELP pdf_to_excel_stage_seconds Time spent in each conversion stage.",
+            "# TYPE pdf_to_excel_stage_seconds summary",
+        ]
+        for stage, stats in sorted(self.stages.items()):
+            lines.append(f'pdf_to_excel_stage_seconds_count{{stage="{stage}"}} {stats["count"]}')
+            lines.append(f'pdf_to_excel_stage_seconds_sum{{stage="{stage}"}} {stats["sum"]:.6f}')
+        lines += [
+            "# HELP pdf_to_excel_stage_seconds_max Slowest single occurrence of each stage.",
+            "# TYPE pdf_to_excel_stage_seconds_max gauge",
+        ]
+        for stage, stats in sorted(self.stages.items()):
+            lines.append(f'pdf_to_excel_stage_seconds_max{{stage="{stage}"}} {stats["max"]:.6f}')
+
+        lines += [
+            "# HELP pdf_to_excel_file_seconds Wall time of each file's conversion.",
+            "# TYPE pdf_to_excel_file_seconds histogram",
+        ]
+        for bound in FILE_SECONDS_BUCKETS:
+            count = sum(1 for seconds in self.file_seconds if seconds <= bound)
+            lines.append(f'pdf_to_excel_file_seconds_bucket{{le="{bound}"}} {count}')
+        lines.append(f'pdf_to_excel_file_seconds_bucket{{le="+Inf"}} {len(self.file_seconds)}')
+        lines.append(f'pdf_to_excel_file_seconds_count {len(self.file_seconds)}')
+        lines.append(f'pdf_to_excel_file_seconds_sum {sum(self.file_seconds):.6f}')
+
+        lines += [
+            "# HELP pdf_to_excel_file_peak_memory_bytes Highest peak resident memory of a worker during one file.",
+            "# TYPE pdf_to_excel_file_peak_memory_bytes gauge",
+            f"pdf_to_excel_file_peak_memory_bytes {self.peak_rss_mb * 1024 * 1024:.0f}",
+        ]
+        lines += [
+            "# HELP pdf_to_excel_files_total Files converted, by result.",
+            "# TYPE pdf_to_excel_files_total counter",
+        ]
+        for result, count in self.files.items():
+            lines.append(f'pdf_to_excel_files_total{{result="{result}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self):
+        # Written whole and renamed into place, as textfile collectors expect
+        directory = os.path.dirname(os.path.abspath(self.prometheus_path))
+        fd, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as file:
+            file.write(self.prometheus_text())
+        os.replace(temp_path, self.prometheus_path)
+
+
+@contextmanager
+def profiled(output_prefix, log):
+    """cProfile and tracemalloc around one conversion; writes ``.prof`` and ``.memory.txt`` files."""
+    profiler = cProfile.Profile()
+    tracemalloc.start()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        profiler.dump_stats(output_prefix + '.prof')
+        with open(output_prefix + '.memory.txt', 'w', encoding='utf-8') as file:
+            file.write(f"Traced Python memory: {current / 1024 / 1024:.1f} MB at end, "
+                       f"{peak / 1024 / 1024:.1f} MB peak\n\n")
+            for stat in snapshot.statistics('lineno')[:PROFILE_TOP_LINES]:
+                file.write(f"{stat}\n")
+
+        log(f"Profile written to {output_prefix}.prof and {output_prefix}.memory.txt "
+            f"(peak traced memory {peak / 1024 / 1024:.1f} MB)")
@@ -0,0 +1,112 @@
+"""Cheap per-page pre-scans: engine routing for the ``auto`` method and the table-free page filter."""
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+
+# Both orientations need at least this many ruling edges for a page to count as ruled
+RULED_MIN_EDGES = 2
+# Horizontal gap, in points, wider than normal word spacing that separates table cells
+COLUMN_GAP = 10
+# Segment edges within this many points of each other count as the same column edge
+ALIGNMENT_TOLERANCE = 3
+
+
+@dataclass
+class PageProfile:
+    page_number: int
+    char_count: int
+    horizontal_rules: int
+    vertical_rules: int
+    char_density: float
+    scan_seconds: float
+    attempts: list = field(default_factory=list)
+
+    @property
+    def has_text(self):
+        return self.char_count > 0
+
+    @property
+    def is_ruled(self):
+        return self.horizontal_rules >= RULED_MIN_EDGES and self.vertical_rules >= RULED_MIN_EDGES
+
+    def describe(self):
+        kind = "ruled" if self.is_ruled else "unruled"
+        return (f"{kind}, {self.char_count} chars, {self.horizontal_rules}h/{self.vertical_rules}v rules, "
+                f"density {self.char_density:.1f}")
+
+
+def classify_page(page, page_number):
+    # Only reads object lists pdfplumber already parsed; extracting from the same
+    # page object afterwards reuses them
+    start = time.perf_counter()
+    edges = page.edges
+    horizontal = sum(1 for edge in edges if edge['orientation'] == 'h')
+    vertical = sum(1 for edge in edges if edge['orientation'] == 'v')
+    char_count = len(page.chars)
+    area = float(page.width * page.height) or 1.0
+    return PageProfile(
+        page_number=page_number,
+        char_count=char_count,
+        horizontal_rules=horizontal,
+        vertical_rules=vertical,
+        char_density=char_count * 1000 / area,
+        scan_seconds=time.perf_counter() - start,
+    )
+
+
+def engine_chain(profile, tabula_usable=True):
+    """Engines to try for a page, cheapest likely success first.
+
+    Ruled pages go to pdfplumber, whose line strategy reuses the objects the
+    scan already parsed, with camelot's lattice parser as the heavier
+    fallback. Unruled text goes to tabula's stream detection first. Pages
+    without a text layer are scanned images no engine can read, so they get
+    no engines at all.
+    """
+    if not profile.has_text:
+        return []
+    if profile.is_ruled:
+        chain = ['pdfplumber', 'camelot', 'tabula']
+    else:
+        chain = ['tabula', 'pdfplumber']
+    return [engine for engine in chain if tabula_usable or engine != 'tabula']
+
+
+def aligned_rows(page):
+    """Number of text lines with two or more cells lined up with cells on other lines.
+
+    Each line is split into segments wherever the gap between words exceeds
+    ``COLUMN_GAP``. Prose yields one segment per line; table rows yield one
+    per cell, and their left or right edges repeat from row to row.
+    """
+    lines = {}
+    for word in page.extract_words():
+        lines.setdefault(round(word['top']), []).append(word)
+
+    line_edges = []
+    for words in lines.values():
+        words.sort(key=lambda word: word['x0'])
+        segments = [[words[0]['x0'], words[0]['x1']]]
+        for word in words[1:]:
+            if word['x0'] - segments[-1][1] > COLUMN_GAP:
+                segments.append([word['x0'], word['x1']])
+            else:
+                segments[-1][1] = word['x1']
+        if len(segments) > 1:
+            line_edges.append([(round(x0 / ALIGNMENT_TOLERANCE), round(x1 / ALIGNMENT_TOLERANCE))
+                               for x0, x1 in segments])
+
+    starts = Counter(start for edges in line_edges for start in {start for start, _ in edges})
+    ends = Counter(end for edges in line_edges for end in {end for _, end in edges})
+    return sum(1 for edges in line_edges
+               if sum(1 for start, end in edges if starts[start] > 1 or ends[end] > 1) >= 2)
+
+
+def has_table_structure(page, min_aligned_rows=3):
+    # Ruling lines are checked first because they are cheaper than grouping words
+    edges = page.edges
+    horizontal = sum(1 for edge in edges if edge['orientation'] == 'h')
+    vertical = sum(1 for edge in edges if edge['orientation'] == 'v')
+    if horizontal >= RULED_MIN_EDGES and vertical >= RULED_MIN_EDGES:
+        return True
+    return aligned_rows(page) >= min_aligned_rows
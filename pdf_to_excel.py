@@ -1,17 +1,18 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext
-import pandas as pd
-import tabula
-import PyPDF2
 import os
-from pathlib import Path
+import sys
 import threading
-from datetime import datetime
-import openpyxl
-from openpyxl.styles import Font, PatternFill, Alignment
-import camelot
-import pdfplumber
-import json
+import importlib.util
+import multiprocessing
+from dataclasses import replace
+from converter_core import ConversionOptions, OUTPUT_FORMATS, SETTINGS_FILE, load_options, save_options
+from batch import BatchConverter
+from event_channel import EventChannel
+
+# How often queued log lines and progress are flushed to the widgets, and how many log lines are kept
+LOG_FLUSH_MS = 100
+LOG_MAX_LINES = 5000
 
 class PDFToExcelConverter:
     def __init__(self):
@@ -22,23 +23,38 @@ class PDFToExcelConverter:
         
         # Variables
         self.selected_files = []
+        self.events = EventChannel()
+        self.cancel_event = threading.Event()
+        self.options = ConversionOptions()
         self.output_directory = tk.StringVar()
         self.conversion_method = tk.StringVar(value="tabula")
+        self.output_format = tk.StringVar(value="xlsx")
         self.password = tk.StringVar()
         self.progress_var = tk.DoubleVar()
         self.status_var = tk.StringVar(value="Ready")
+        self.workers = tk.IntVar(value=0)
+        self.page_workers = tk.IntVar(value=1)
         
         # Conversion settings
         self.settings = {
             'extract_all_pages': tk.BooleanVar(value=True),
             'page_range': tk.StringVar(value="1-"),
             'multiple_tables': tk.BooleanVar(value=True),
+            'stitch_tables': tk.BooleanVar(value=False),
+            'infer_types': tk.BooleanVar(value=False),
+            'memory_bounded': tk.BooleanVar(value=False),
             'format_output': tk.BooleanVar(value=True),
-            'include_metadata': tk.BooleanVar(value=False)
+            'include_metadata': tk.BooleanVar(value=False),
+            'streaming_output': tk.BooleanVar(value=False),
+            'use_cache': tk.BooleanVar(value=False),
+            'use_page_cache': tk.BooleanVar(value=False),
+            'skip_table_free_pages': tk.BooleanVar(value=False),
+            'resume': tk.BooleanVar(value=False)
         }
         
         self.setup_ui()
         self.load_settings()
+        self.root.after(LOG_FLUSH_MS, self.poll_events)
         
     def setup_ui(self):
         # Main frame
@@ -101,12 +117,19 @@ class PDFToExcelConverter:
                        variable=self.conversion_method, value="camelot").grid(row=0, column=1, padx=(10, 0))
         ttk.Radiobutton(method_frame, text="PDFPlumber (Advanced)", 
                        variable=self.conversion_method, value="pdfplumber").grid(row=0, column=2, padx=(10, 0))
+        ttk.Radiobutton(method_frame, text="Auto (per page)", 
+                       variable=self.conversion_method, value="auto").grid(row=0, column=3, padx=(10, 0))
         
         # Password field
         ttk.Label(settings_frame, text="Password (if required):").grid(row=1, column=0, sticky=tk.W, pady=(10, 0))
         ttk.Entry(settings_frame, textvariable=self.password, 
                  show="*").grid(row=1, column=1, sticky=(tk.W, tk.E), padx=(10, 0), pady=(10, 0))
         
+        # Output format
+        ttk.Label(settings_frame, text="Output format:").grid(row=4, column=0, sticky=tk.W, pady=(10, 0))
+        ttk.Combobox(settings_frame, textvariable=self.output_format, values=OUTPUT_FORMATS, 
+                    state='readonly', width=12).grid(row=4, column=1, sticky=tk.W, padx=(10, 0), pady=(10, 0))
+        
         # Additional options
         options_frame = ttk.Frame(settings_frame)
         options_frame.grid(row=2, column=0, columnspan=2, sticky=(tk.W, tk.E), pady=(10, 0))
@@ -119,6 +142,22 @@ class PDFToExcelConverter:
                        variable=self.settings['format_output']).grid(row=1, column=0, sticky=tk.W)
         ttk.Checkbutton(options_frame, text="Include metadata", 
                        variable=self.settings['include_metadata']).grid(row=1, column=1, sticky=tk.W, padx=(20, 0))
+        ttk.Checkbutton(options_frame, text="Low-memory output (streaming)", 
+                       variable=self.settings['streaming_output']).grid(row=2, column=0, sticky=tk.W)
+        ttk.Checkbutton(options_frame, text="Reuse cached extractions", 
+                       variable=self.settings['use_cache']).grid(row=2, column=1, sticky=tk.W, padx=(20, 0))
+        ttk.Checkbutton(options_frame, text="Cache per page (grown or re-ranged PDFs)", 
+                       variable=self.settings['use_page_cache']).grid(row=3, column=1, sticky=tk.W, padx=(20, 0))
+        ttk.Checkbutton(options_frame, text="Skip pages without tables", 
+                       variable=self.settings['skip_table_free_pages']).grid(row=3, column=0, sticky=tk.W)
+        ttk.Checkbutton(options_frame, text="Resume: skip files already converted", 
+                       variable=self.settings['resume']).grid(row=4, column=0, sticky=tk.W)
+        ttk.Checkbutton(options_frame, text="Join tables continued across pages", 
+                       variable=self.settings['stitch_tables']).grid(row=4, column=1, sticky=tk.W, padx=(20, 0))
+        ttk.Checkbutton(options_frame, text="Numbers and dates as real values", 
+                       variable=self.settings['infer_types']).grid(row=5, column=0, sticky=tk.W)
+        ttk.Checkbutton(options_frame, text="Memory-bounded (very large PDFs)", 
+                       variable=self.settings['memory_bounded']).grid(row=5, column=1, sticky=tk.W, padx=(20, 0))
         
         # Page range
         page_frame = ttk.Frame(settings_frame)
@@ -129,6 +168,16 @@ class PDFToExcelConverter:
                  width=20).grid(row=0, column=1, sticky=tk.W, padx=(10, 0))
         ttk.Label(page_frame, text="(e.g., 1-5, 1,3,5, or 1- for all)").grid(row=0, column=2, sticky=tk.W, padx=(10, 0))
         
+        # Worker processes
+        ttk.Label(page_frame, text="Workers:").grid(row=1, column=0, sticky=tk.W, pady=(10, 0))
+        ttk.Spinbox(page_frame, from_=0, to=64, textvariable=self.workers, 
+                   width=5).grid(row=1, column=1, sticky=tk.W, padx=(10, 0), pady=(10, 0))
+        ttk.Label(page_frame, text="(0 = one per CPU core)").grid(row=1, column=2, sticky=tk.W, padx=(10, 0), pady=(10, 0))
+        ttk.Label(page_frame, text="Page workers:").grid(row=2, column=0, sticky=tk.W, pady=(10, 0))
+        ttk.Spinbox(page_frame, from_=1, to=64, textvariable=self.page_workers, 
+                   width=5).grid(row=2, column=1, sticky=tk.W, padx=(10, 0), pady=(10, 0))
+        ttk.Label(page_frame, text="(split large PDFs into page chunks)").grid(row=2, column=2, sticky=tk.W, padx=(10, 0), pady=(10, 0))
+        
         # Conversion section
         convert_frame = ttk.LabelFrame(main_frame, text="Convert", padding="10")
         convert_frame.grid(row=4, column=0, columnspan=3, sticky=(tk.W, tk.E), pady=(0, 10))
@@ -137,10 +186,14 @@ class PDFToExcelConverter:
                                         command=self.start_conversion)
         self.convert_button.grid(row=0, column=0, sticky=tk.W)
         
+        self.cancel_button = ttk.Button(convert_frame, text="Cancel", state='disabled',
+                                       command=self.cancel_conversion)
+        self.cancel_button.grid(row=0, column=1, sticky=tk.W, padx=(10, 0))
+        
         ttk.Button(convert_frame, text="Save Settings", 
-                  command=self.save_settings).grid(row=0, column=1, sticky=tk.W, padx=(10, 0))
+                  command=self.save_settings).grid(row=0, column=2, sticky=tk.W, padx=(10, 0))
         ttk.Button(convert_frame, text="Load Settings", 
-                  command=self.load_settings).grid(row=0, column=2, sticky=tk.W, padx=(10, 0))
+                  command=self.load_settings).grid(row=0, column=3, sticky=tk.W, padx=(10, 0))
         
         # Progress section
         progress_frame = ttk.LabelFrame(main_frame, text="Progress", padding="10")
@@ -196,11 +249,30 @@ class PDFToExcelConverter:
             self.log(f"Output directory set to: {directory}")
             
     def log(self, message):
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        log_message = f"[{timestamp}] {message}\n"
-        self.log_text.insert(tk.END, log_message)
+        # Safe from any thread: lines are queued and written by poll_events on the Tk thread
+        self.events.log(message)
+
+    def poll_events(self):
+        # Rescheduled first so a summary dialog opened below does not pause the log
+        self.root.after(LOG_FLUSH_MS, self.poll_events)
+        lines, latest = self.events.drain()
+        if lines:
+            self.append_log(lines)
+        if 'progress' in latest:
+            done, total = latest['progress']
+            self.progress_var.set((done / total) * 100)
+        if 'status' in latest:
+            self.status_var.set(latest['status'])
+        if 'finish' in latest:
+            self.finish_conversion(latest['finish'])
+
+    def append_log(self, lines):
+        lines = lines[-LOG_MAX_LINES:]
+        self.log_text.insert(tk.END, "\n".join(lines) + "\n")
+        line_count = int(self.log_text.index('end-1c').split('.')[0]) - 1
+        if line_count > LOG_MAX_LINES:
+            self.log_text.delete('1.0', f"{line_count - LOG_MAX_LINES + 1}.0")
         self.log_text.see(tk.END)
-        self.root.update_idletasks()
         
     def start_conversion(self):
         if not self.selected_files:
@@ -211,257 +283,94 @@ class PDFToExcelConverter:
             messagebox.showerror("Error", "Please select an output directory")
             return
             
+        # Read before any widget changes, so a bad value leaves the window ready to retry
+        try:
+            options = self.get_options()
+        except tk.TclError:
+            messagebox.showerror("Error", "Workers and Page workers must be whole numbers")
+            return
+            
         self.convert_button.config(state='disabled')
+        self.cancel_button.config(state='normal')
+        self.cancel_event = threading.Event()
         self.progress_var.set(0)
         self.status_var.set("Converting...")
         
-        # Start conversion in a separate thread
-        thread = threading.Thread(target=self.convert_files)
+        # Start conversion in a separate thread; it only talks back through self.events
+        thread = threading.Thread(target=self.convert_files, args=(options, list(self.selected_files)))
         thread.daemon = True
         thread.start()
         
-    def convert_files(self):
+    def get_options(self):
+        # Options without a widget keep the values loaded from the settings file
+        return replace(
+            self.options,
+            output_directory=self.output_directory.get(),
+            conversion_method=self.conversion_method.get(),
+            output_format=self.output_format.get(),
+            password=self.password.get(),
+            extract_all_pages=self.settings['extract_all_pages'].get(),
+            page_range=self.settings['page_range'].get(),
+            multiple_tables=self.settings['multiple_tables'].get(),
+            stitch_tables=self.settings['stitch_tables'].get(),
+            infer_types=self.settings['infer_types'].get(),
+            format_output=self.settings['format_output'].get(),
+            include_metadata=self.settings['include_metadata'].get(),
+            streaming_output=self.settings['streaming_output'].get(),
+            memory_bounded=self.settings['memory_bounded'].get(),
+            use_cache=self.settings['use_cache'].get(),
+            use_page_cache=self.settings['use_page_cache'].get(),
+            skip_table_free_pages=self.settings['skip_table_free_pages'].get(),
+            resume=self.settings['resume'].get(),
+            workers=self.workers.get(),
+            page_workers=self.page_workers.get()
+        )
+
+    def convert_files(self, options, pdf_files):
+        summary = None
         try:
-            total_files = len(self.selected_files)
-            successful_conversions = 0
-            self.conversion_summary = {'success': [], 'fail': []}
-            for i, pdf_file in enumerate(self.selected_files):
-                self.log(f"Converting: {os.path.basename(pdf_file)}")
-                try:
-                    success = self.convert_single_file(pdf_file)
-                    if success:
-                        successful_conversions += 1
-                        self.conversion_summary['success'].append(os.path.basename(pdf_file))
-                        self.log(f"✓ Successfully converted: {os.path.basename(pdf_file)}")
-                    else:
-                        self.conversion_summary['fail'].append(os.path.basename(pdf_file))
-                        self.log(f"✗ Failed to convert: {os.path.basename(pdf_file)}")
-                except Exception as e:
-                    self.conversion_summary['fail'].append(os.path.basename(pdf_file))
-                    self.log(f"✗ Error converting {os.path.basename(pdf_file)}: {str(e)}")
-                # Update progress
-                progress = ((i + 1) / total_files) * 100
-                self.progress_var.set(progress)
-            self.log(f"Conversion complete! {successful_conversions}/{total_files} files converted successfully")
-            self.status_var.set(f"Complete: {successful_conversions}/{total_files} files converted")
-            self.show_conversion_summary()
+            batch = BatchConverter(options, logger=self.events.log, progress_callback=self.events.progress,
+                                   cancel_event=self.cancel_event)
+            summary = batch.convert_files(pdf_files)
+            self.events.status(f"Complete: {len(summary['success'])}/{len(pdf_files)} files converted")
         except Exception as e:
-            self.log(f"Conversion error: {str(e)}")
-            self.status_var.set("Error occurred during conversion")
+            self.events.log(f"Conversion error: {str(e)}")
+            self.events.status("Error occurred during conversion")
         finally:
-            self.convert_button.config(state='normal')
+            self.events.finish(summary)
+
+    def cancel_conversion(self):
+        self.cancel_event.set()
+        self.cancel_button.config(state='disabled')
+        self.status_var.set("Cancelling after the files in progress...")
+
+    def finish_conversion(self, summary):
+        self.convert_button.config(state='normal')
+        self.cancel_button.config(state='disabled')
+        if summary is not None:
+            self.conversion_summary = summary
+            self.show_conversion_summary()
 
     def show_conversion_summary(self):
         summary = f"Success: {len(self.conversion_summary['success'])}\n" \
-                  f"Failed: {len(self.conversion_summary['fail'])}\n\n"
+                  f"Failed: {len(self.conversion_summary['fail'])}\n"
+        if self.conversion_summary['skipped']:
+            summary += f"Already converted: {len(self.conversion_summary['skipped'])}\n"
+        if self.conversion_summary['cancelled']:
+            summary += f"Cancelled: {len(self.conversion_summary['cancelled'])}\n"
+        if self.settings['use_cache'].get() or self.settings['use_page_cache'].get():
+            cache = self.conversion_summary['cache']
+            summary += f"Cache: {cache['hits']} hits, {cache['misses']} misses\n"
+        summary += "\n"
         if self.conversion_summary['success']:
             summary += "Successful files:\n" + "\n".join(self.conversion_summary['success']) + "\n\n"
         if self.conversion_summary['fail']:
             summary += "Failed files:\n" + "\n".join(self.conversion_summary['fail'])
         messagebox.showinfo("Conversion Summary", summary)
 
-    def convert_single_file(self, pdf_file):
-        try:
-            base_name = os.path.splitext(os.path.basename(pdf_file))[0]
-            output_file = os.path.join(self.output_directory.get(), f"{base_name}.xlsx")
-            
-            # Check if PDF is password protected
-            if self.is_password_protected(pdf_file):
-                if not self.password.get():
-                    self.log(f"Password required for {os.path.basename(pdf_file)}")
-                    return False
-                    
-            # Extract tables based on selected method
-            if self.conversion_method.get() == "tabula":
-                tables = self.extract_with_tabula(pdf_file)
-            elif self.conversion_method.get() == "camelot":
-                tables = self.extract_with_camelot(pdf_file)
-            else:
-                tables = self.extract_with_pdfplumber(pdf_file)
-                
-            if not tables:
-                self.log(f"No tables found in {os.path.basename(pdf_file)}")
-                return False
-                
-            # Save to Excel
-            self.save_to_excel(tables, output_file, pdf_file)
-            return True
-            
-        except Exception as e:
-            self.log(f"Error in convert_single_file: {str(e)}")
-            return False
-            
-    def is_password_protected(self, pdf_file):
-        try:
-            with open(pdf_file, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                return pdf_reader.is_encrypted
-        except:
-            return False
-            
-    def extract_with_tabula(self, pdf_file):
-        try:
-            password = self.password.get() if self.password.get() else None
-            pages = self.get_page_range()
-            
-            if self.settings['multiple_tables'].get():
-                tables = tabula.read_pdf(pdf_file, pages=pages, multiple_tables=True, password=password)
-            else:
-                tables = [tabula.read_pdf(pdf_file, pages=pages, password=password)]
-                
-            return [table for table in tables if not table.empty]
-            
-        except Exception as e:
-            self.log(f"Tabula extraction error: {str(e)}")
-            return []
-            
-    def extract_with_camelot(self, pdf_file):
-        try:
-            pages = self.get_page_range()
-            tables = camelot.read_pdf(pdf_file, pages=pages, password=self.password.get())
-            return [table.df for table in tables]
-            
-        except Exception as e:
-            self.log(f"Camelot extraction error: {str(e)}")
-            return []
-            
-    def extract_with_pdfplumber(self, pdf_file):
-        try:
-            tables = []
-            password = self.password.get() if self.password.get() else None
-            
-            with pdfplumber.open(pdf_file, password=password) as pdf:
-                pages = self.get_page_numbers(len(pdf.pages))
-                
-                for page_num in pages:
-                    page = pdf.pages[page_num - 1]
-                    page_tables = page.extract_tables()
-                    
-                    for table in page_tables:
-                        if table:
-                            df = pd.DataFrame(table[1:], columns=table[0])
-                            tables.append(df)
-                            
-            return tables
-            
-        except Exception as e:
-            self.log(f"PDFPlumber extraction error: {str(e)}")
-            return []
-            
-    def get_page_range(self):
-        if self.settings['extract_all_pages'].get():
-            return 'all'
-        else:
-            return self.settings['page_range'].get()
-            
-    def get_page_numbers(self, total_pages):
-        if self.settings['extract_all_pages'].get():
-            return list(range(1, total_pages + 1))
-        
-        page_range = self.settings['page_range'].get()
-        pages = []
-        
-        try:
-            if '-' in page_range:
-                start, end = page_range.split('-')
-                start = int(start) if start else 1
-                end = int(end) if end else total_pages
-                pages = list(range(start, min(end + 1, total_pages + 1)))
-            elif ',' in page_range:
-                pages = [int(p.strip()) for p in page_range.split(',')]
-                pages = [p for p in pages if 1 <= p <= total_pages]
-            else:
-                page_num = int(page_range)
-                if 1 <= page_num <= total_pages:
-                    pages = [page_num]
-                    
-        except ValueError:
-            self.log(f"Invalid page range: {page_range}")
-            pages = [1]
-            
-        return pages
-        
-    def save_to_excel(self, tables, output_file, pdf_file):
-        try:
-            with pd.ExcelWriter(output_file, engine='openpyxl') as writer:
-                for i, table in enumerate(tables):
-                    sheet_name = f"Table_{i+1}" if len(tables) > 1 else "Data"
-                    table.to_excel(writer, sheet_name=sheet_name, index=False)
-                    
-                    if self.settings['format_output'].get():
-                        self.format_excel_sheet(writer, sheet_name, table)
-                        
-                # Add metadata sheet if requested
-                if self.settings['include_metadata'].get():
-                    self.add_metadata_sheet(writer, pdf_file, len(tables))
-                    
-        except Exception as e:
-            self.log(f"Excel save error: {str(e)}")
-            raise
-            
-    def format_excel_sheet(self, writer, sheet_name, table):
-        try:
-            worksheet = writer.sheets[sheet_name]
-            
-            # Header formatting
-            header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-            header_font = Font(color="FFFFFF", bold=True)
-            
-            for col_num, column_title in enumerate(table.columns, 1):
-                cell = worksheet.cell(row=1, column=col_num)
-                cell.fill = header_fill
-                cell.font = header_font
-                cell.alignment = Alignment(horizontal="center")
-                
-            # Auto-adjust column widths
-            for column in worksheet.columns:
-                max_length = 0
-                column_letter = column[0].column_letter
-                
-                for cell in column:
-                    try:
-                        if len(str(cell.value)) > max_length:
-                            max_length = len(str(cell.value))
-                    except:
-                        pass
-                        
-                adjusted_width = min(max_length + 2, 50)
-                worksheet.column_dimensions[column_letter].width = adjusted_width
-                
-        except Exception as e:
-            self.log(f"Formatting error: {str(e)}")
-            
-    def add_metadata_sheet(self, writer, pdf_file, table_count):
-        try:
-            metadata = {
-                'Source PDF': [os.path.basename(pdf_file)],
-                'Conversion Date': [datetime.now().strftime("%Y-%m-%d %H:%M:%S")],
-                'Extraction Method': [self.conversion_method.get()],
-                'Tables Found': [table_count],
-                'File Size': [f"{os.path.getsize(pdf_file) / 1024:.2f} KB"]
-            }
-            
-            metadata_df = pd.DataFrame(metadata)
-            metadata_df.to_excel(writer, sheet_name="Metadata", index=False)
-            
-        except Exception as e:
-            self.log(f"Metadata error: {str(e)}")
-            
     def save_settings(self):
         try:
-            settings = {
-                'output_directory': self.output_directory.get(),
-                'conversion_method': self.conversion_method.get(),
-                'extract_all_pages': self.settings['extract_all_pages'].get(),
-                'page_range': self.settings['page_range'].get(),
-                'multiple_tables': self.settings['multiple_tables'].get(),
-                'format_output': self.settings['format_output'].get(),
-                'include_metadata': self.settings['include_metadata'].get()
-            }
-            
-            with open('pdf_converter_settings.json', 'w') as f:
-                json.dump(settings, f, indent=2)
-                
+            save_options(self.get_options())
             self.log("Settings saved successfully")
             
         except Exception as e:
@@ -469,17 +378,28 @@ class PDFToExcelConverter:
             
     def load_settings(self):
         try:
-            if os.path.exists('pdf_converter_settings.json'):
-                with open('pdf_converter_settings.json', 'r') as f:
-                    settings = json.load(f)
+            if os.path.exists(SETTINGS_FILE):
+                options = load_options()
+                self.options = options
                     
-                self.output_directory.set(settings.get('output_directory', ''))
-                self.conversion_method.set(settings.get('conversion_method', 'tabula'))
-                self.settings['extract_all_pages'].set(settings.get('extract_all_pages', True))
-                self.settings['page_range'].set(settings.get('page_range', '1-'))
-                self.settings['multiple_tables'].set(settings.get('multiple_tables', True))
-                self.settings['format_output'].set(settings.get('format_output', True))
-                self.settings['include_metadata'].set(settings.get('include_metadata', False))
+                self.output_directory.set(options.output_directory)
+                self.conversion_method.set(options.conversion_method)
+                self.output_format.set(options.output_format)
+                self.settings['extract_all_pages'].set(options.extract_all_pages)
+                self.settings['page_range'].set(options.page_range)
+                self.settings['multiple_tables'].set(options.multiple_tables)
+                self.settings['format_output'].set(options.format_output)
+                self.settings['include_metadata'].set(options.include_metadata)
+                self.settings['streaming_output'].set(options.streaming_output)
+                self.settings['use_cache'].set(options.use_cache)
+                self.settings['use_page_cache'].set(options.use_page_cache)
+                self.settings['skip_table_free_pages'].set(options.skip_table_free_pages)
+                self.settings['resume'].set(options.resume)
+                self.settings['stitch_tables'].set(options.stitch_tables)
+                self.settings['infer_types'].set(options.infer_types)
+                self.settings['memory_bounded'].set(options.memory_bounded)
+                self.workers.set(options.workers)
+                self.page_workers.set(options.page_workers)
                 
                 self.log("Settings loaded successfully")
                 
@@ -517,23 +437,20 @@ class PDFToExcelConverter:
         self.root.mainloop()
 
 if __name__ == "__main__":
-    # Check for required packages
-    required_packages = [
-        'pandas', 'tabula-py', 'PyPDF2', 'openpyxl', 
-        'camelot-py[cv]', 'pdfplumber'
-    ]
-    
-    missing_packages = []
+    multiprocessing.freeze_support()
+
+    if len(sys.argv) > 1:
+        from cli import main
+        sys.exit(main())
+
+    # Check for required packages without importing them; each engine loads when first used
+    required_packages = {
+        'pandas': 'pandas', 'tabula': 'tabula-py', 'PyPDF2': 'PyPDF2', 'openpyxl': 'openpyxl',
+        'camelot': 'camelot-py[cv]', 'pdfplumber': 'pdfplumber'
+    }
     
-    try:
-        import pandas
-        import tabula
-        import PyPDF2
-        import openpyxl
-        import camelot
-        import pdfplumber
-    except ImportError as e:
-        missing_packages.append(str(e))
+    missing_packages = [package for module, package in required_packages.items()
+                        if importlib.util.find_spec(module) is None]
         
     if missing_packages:
         print("Missing required packages. Install them using:")
@@ -541,4 +458,4 @@ if __name__ == "__main__":
         print("\nMissing packages:", missing_packages)
     else:
         app = PDFToExcelConverter()
-        app.run()
\ No newline at end of file
+        app.run()
@@ -0,0 +1,492 @@
+"""Local HTTP conversion service: submit a PDF, poll its status, download the result.
+
+    python service.py --port 8765 -m pdfplumber -w 4
+
+    curl --data-binary @statement.pdf 'http://127.0.0.1:8765/jobs?filename=statement.pdf&stitch=1'
+    curl http://127.0.0.1:8765/jobs/<id>
+    curl -o statement.xlsx http://127.0.0.1:8765/jobs/<id>/download
+
+An asyncio front end speaks just enough HTTP/1.1 for programmatic clients
+(one request per connection, Content-Length bodies). Conversions run the
+batch worker task on a process pool whose workers are started and have
+their engine imported before the first request arrives. Jobs beyond the
+pool wait in a bounded queue; when it is full, submissions get 503.
+"""
+import os
+import sys
+import json
+import time
+import uuid
+import shutil
+import signal
+import asyncio
+import argparse
+from dataclasses import replace
+from datetime import datetime
+from urllib.parse import urlsplit, parse_qs, quote
+from concurrent.futures.process import BrokenProcessPool
+from converter_core import EXTRACTION_METHODS, OUTPUT_FORMATS, SETTINGS_FILE, load_options, timestamped
+from batch import convert_file_task, over_memory_ceiling, resolve_workers, worker_pool
+from metrics import MetricsRecorder
+from memory_limits import MB
+
+REASONS = {
+    200: 'OK', 202: 'Accepted', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+    409: 'Conflict', 411: 'Length Required', 413: 'Payload Too Large', 417: 'Expectation Failed',
+    500: 'Internal Server Error', 503: 'Service Unavailable',
+}
+# Seconds a client gets to send its request line and headers
+HEADER_TIMEOUT = 30
+# Seconds between sweeps for finished jobs past their retention time
+CLEANUP_SECONDS = 60
+UPLOAD_CHUNK = 1024 * 1024
+TRUE_VALUES = ('1', 'true', 'yes', 'on')
+
+# Query parameters a submission may set, and the option each one overrides
+JOB_PARAMETERS = ('filename', 'method', 'pages', 'format', 'stitch', 'infer_types', 'metadata', 'no_format')
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def worker_ready():
+    # Handed to each new worker so the pool starts, and imports its engine, before any job
+    return os.getpid()
+
+
+def failed_result(pdf_file, message):
+    return {'file': pdf_file, 'success': False, 'output_file': None, 'messages': [message], 'cache': {},
+            'timings': [], 'source': None, 'memory': None}
+
+
+class Job:
+    def __init__(self, job_id, pdf_file, options):
+        self.id = job_id
+        self.pdf_file = pdf_file
+        self.options = options
+        self.status = 'queued'
+        self.result = None
+        self.files = []
+        self.received = time.time()
+        self.uploaded = None
+        self.started = None
+        self.finished = None
+
+    def to_dict(self):
+        timings = {}
+        if self.uploaded:
+            timings['upload'] = self.uploaded - self.received
+            timings['queued'] = (self.started or time.time()) - self.uploaded
+        if self.started:
+            timings['convert'] = (self.finished or time.time()) - self.started
+        if self.finished:
+            timings['total'] = self.finished - self.received
+        status = {
+            'id': self.id,
+            'file': os.path.basename(self.pdf_file),
+            'status': self.status,
+            'submitted': datetime.fromtimestamp(self.received).isoformat(timespec='seconds'),
+            'timings': {stage: round(seconds, 3) for stage, seconds in timings.items()},
+            'files': [os.path.basename(path) for path in self.files],
+        }
+        if self.result:
+            status['messages'] = self.result['messages']
+            status['stages'] = [dict(record, seconds=round(record['seconds'], 4))
+                                for record in self.result['timings']]
+            if self.result.get('memory'):
+                status['peak_memory_mb'] = round(self.result['memory']['peak'] / MB, 1)
+        return status
+
+
+class ConversionService:
+    """Job table, warm worker pool and HTTP routes.
+
+    At most ``workers`` conversions run at once and at most ``queue_size``
+    more wait for a worker. Finished jobs, with their files, are dropped
+    ``retain_minutes`` after they finish.
+    """
+
+    def __init__(self, options, work_directory, logger=None, queue_size=100, max_upload_mb=100,
+                 retain_minutes=60):
+        self.options = replace(options, resume=False, journal_file='', profile_file='')
+        self.work_directory = work_directory
+        self.logger = logger
+        self.queue_size = queue_size
+        self.max_upload = max_upload_mb * MB
+        self.retain_seconds = retain_minutes * 60
+        self.workers = resolve_workers(options.workers, sys.maxsize)
+        self.jobs = {}
+        self.queue = None
+        self.executor = None
+        self.pool_ready = None
+        self.recycle = False
+        self.running = 0
+        self.metrics = None
+        if options.metrics_file or options.prometheus_file:
+            self.metrics = MetricsRecorder(options.metrics_file, options.prometheus_file)
+
+    def log(self, message):
+        if self.logger:
+            self.logger(message)
+
+    async def start_pool(self):
+        start = time.perf_counter()
+        executor = worker_pool(self.options, self.workers)
+        loop = asyncio.get_running_loop()
+        # Submitting one task per worker at once makes the pool start every worker now
+        await asyncio.gather(*(loop.run_in_executor(executor, worker_ready) for _ in range(self.workers)))
+        self.executor = executor
+        self.log(f"Started {self.workers} warm {self.options.conversion_method} worker(s) "
+                 f"in {time.perf_counter() - start:.2f}s")
+
+    async def replace_pool(self):
+        self.recycle = False
+        await asyncio.to_thread(self.executor.shutdown)
+        await self.start_pool()
+        self.pool_ready.set()
+
+    async def serve(self, host, port, stop_event):
+        os.makedirs(self.work_directory, exist_ok=True)
+        self.queue = asyncio.Queue(maxsize=self.queue_size)
+        self.pool_ready = asyncio.Event()
+        await self.start_pool()
+        self.pool_ready.set()
+
+        runners = [asyncio.create_task(self.run_jobs()) for _ in range(self.workers)]
+        cleaner = asyncio.create_task(self.clean_up())
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        self.log(f"Listening on http://{host}:{port} (queue of {self.queue_size}, "
+                 f"uploads up to {self.max_upload // MB} MB)")
+        try:
+            await stop_event.wait()
+        finally:
+            server.close()
+            await server.wait_closed()
+            for task in runners + [cleaner]:
+                task.cancel()
+            await asyncio.gather(*runners, cleaner, return_exceptions=True)
+            await asyncio.to_thread(self.executor.shutdown, cancel_futures=True)
+            self.log("Stopped")
+
+    async def run_jobs(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            job = await self.queue.get()
+            await self.pool_ready.wait()
+            job.status = 'running'
+            job.started = time.time()
+            self.running += 1
+            try:
+                result = await loop.run_in_executor(self.executor, convert_file_task, job.pdf_file, job.options)
+            except BrokenProcessPool as e:
+                result = failed_result(job.pdf_file, f"Worker failed on {os.path.basename(job.pdf_file)}: {str(e)}")
+                self.request_recycle("A worker process died")
+            except Exception as e:
+                result = failed_result(job.pdf_file, f"Worker failed on {os.path.basename(job.pdf_file)}: {str(e)}")
+            finally:
+                self.running -= 1
+            self.finish_job(job, result)
+
+            if over_memory_ceiling(result, self.options):
+                self.request_recycle(f"Worker holds {result['memory']['rss'] / MB:.0f} MB, over the "
+                                     f"{self.options.max_worker_memory_mb} MB ceiling")
+            if self.recycle and self.running == 0:
+                # The last job to finish replaces the pool; the other runners wait on pool_ready
+                await self.replace_pool()
+
+    def request_recycle(self, reason):
+        if not self.recycle:
+            self.recycle = True
+            self.pool_ready.clear()
+            self.log(f"{reason}; recycling workers once the running jobs finish")
+
+    def finish_job(self, job, result):
+        job.result = result
+        job.finished = time.time()
+        output_directory = job.options.output_directory
+        job.files = sorted(os.path.join(output_directory, name) for name in os.listdir(output_directory)
+                           if os.path.isfile(os.path.join(output_directory, name)))
+        job.status = 'done' if result['success'] and job.files else 'failed'
+        self.log(f"{'✓' if job.status == 'done' else '✗'} Job {job.id} ({os.path.basename(job.pdf_file)}) "
+                 f"{job.status} in {job.finished - job.started:.2f}s after "
+                 f"{job.started - (job.uploaded or job.received):.2f}s queued")
+        if self.metrics:
+            try:
+                self.metrics.record_file(job.pdf_file, result['success'], result['timings'])
+                if self.options.prometheus_file:
+                    self.metrics.write_prometheus()
+            except Exception as e:
+                self.log(f"Could not record metrics: {str(e)}")
+
+    async def clean_up(self):
+        while True:
+            await asyncio.sleep(CLEANUP_SECONDS)
+            cutoff = time.time() - self.retain_seconds
+            for job in [job for job in self.jobs.values() if job.finished and job.finished < cutoff]:
+                self.delete_job(job)
+
+    def delete_job(self, job):
+        del self.jobs[job.id]
+        shutil.rmtree(os.path.join(self.work_directory, job.id), ignore_errors=True)
+
+    async def handle_connection(self, reader, writer):
+        start = time.perf_counter()
+        method = path = '-'
+        status = 500
+        try:
+            try:
+                method, target, headers = await asyncio.wait_for(read_head(reader), HEADER_TIMEOUT)
+                url = urlsplit(target)
+                path = url.path
+                status = await self.route(method, path, parse_qs(url.query), headers, reader, writer, start)
+            except HTTPError as e:
+                status = e.status
+                await send_json(writer, status, {'error': str(e)}, start)
+            except asyncio.TimeoutError:
+                status = 408
+                return
+            except Exception as e:
+                self.log(f"Request error: {str(e)}")
+                await send_json(writer, 500, {'error': str(e)}, start)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+            self.log(f"{method} {path} {status} {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    async def route(self, method, path, query, headers, reader, writer, start):
+        parts = [part for part in path.split('/') if part]
+        if parts == ['health'] and method == 'GET':
+            counts = {}
+            for job in self.jobs.values():
+                counts[job.status] = counts.get(job.status, 0) + 1
+            return await send_json(writer, 200, {'workers': self.workers, 'engine': self.options.conversion_method,
+                                                 'queued': self.queue.qsize(), 'running': self.running,
+                                                 'jobs': counts}, start)
+        if parts == ['jobs']:
+            if method != 'POST':
+                raise HTTPError(405, "Submit jobs with POST")
+            return await self.submit(query, headers, reader, writer, start)
+        if len(parts) in (2, 3) and parts[0] == 'jobs':
+            job = self.jobs.get(parts[1])
+            if job is None:
+                raise HTTPError(404, f"No job {parts[1]}")
+            if len(parts) == 3 and parts[2] == 'download' and method == 'GET':
+                return await self.download(job, query, writer, start)
+            if len(parts) == 2 and method == 'GET':
+                return await send_json(writer, 200, job.to_dict(), start)
+            if len(parts) == 2 and method == 'DELETE':
+                if job.status in ('queued', 'running'):
+                    raise HTTPError(409, f"Job {job.id} is {job.status}")
+                self.delete_job(job)
+                return await send_json(writer, 200, {'id': job.id, 'status': 'deleted'}, start)
+            raise HTTPError(405, f"{method} is not supported on {path}")
+        raise HTTPError(404, f"No route for {path}")
+
+    async def submit(self, query, headers, reader, writer, start):
+        if 'transfer-encoding' in headers:
+            raise HTTPError(411, "Send the PDF with a Content-Length")
+        expect = headers.get('expect', '').lower()
+        if expect and expect != '100-continue':
+            raise HTTPError(417, f"Unsupported expectation: {expect}")
+        try:
+            length = int(headers.get('content-length') or 0)
+        except ValueError:
+            raise HTTPError(400, "Content-Length must be a whole number of bytes")
+        if length < 0:
+            raise HTTPError(400, "Content-Length must not be negative")
+        if not length:
+            raise HTTPError(400, "The request body must be the PDF file")
+        if length > self.max_upload:
+            raise HTTPError(413, f"Uploads are limited to {self.max_upload // MB} MB")
+        if self.queue.full():
+            raise HTTPError(503, f"{self.queue.qsize()} jobs are already waiting; retry later")
+
+        job_id = uuid.uuid4().hex
+        job_directory = os.path.join(self.work_directory, job_id)
+        options = job_options(self.options, query, headers, job_directory)
+        name = os.path.basename(query.get('filename', ['document.pdf'])[-1]) or 'document.pdf'
+        if not name.lower().endswith('.pdf'):
+            name += '.pdf'
+        os.makedirs(os.path.join(job_directory, 'input'))
+        job = Job(job_id, os.path.join(job_directory, 'input', name), options)
+        if expect:
+            # Every check that could refuse the upload has passed; curl waits a second for this otherwise
+            writer.write(b"HTTP/1.1 100 Continue\r\n\r\n")
+        try:
+            with open(job.pdf_file, 'wb') as file:
+                remaining = length
+                while remaining:
+                    chunk = await reader.read(min(UPLOAD_CHUNK, remaining))
+                    if not chunk:
+                        raise HTTPError(400, "The upload ended before Content-Length bytes arrived")
+                    file.write(chunk)
+                    remaining -= len(chunk)
+            self.queue.put_nowait(job)
+        except (HTTPError, asyncio.QueueFull, ConnectionError):
+            shutil.rmtree(job_directory, ignore_errors=True)
+            if self.queue.full():
+                raise HTTPError(503, "The queue filled up during the upload; retry later")
+            raise
+        job.uploaded = time.time()
+        self.jobs[job_id] = job
+        return await send_json(writer, 202, job.to_dict(), start, {'Location': f"/jobs/{job_id}"})
+
+    async def download(self, job, query, writer, start):
+        if job.status != 'done':
+            raise HTTPError(409, f"Job {job.id} is {job.status}")
+        names = [os.path.basename(path) for path in job.files]
+        name = query.get('file', [names[0]])[-1]
+        if name not in names:
+            raise HTTPError(404, f"Job {job.id} has no file {name}; it has {', '.join(names)}")
+        path = job.files[names.index(name)]
+        headers = {
+            'Content-Type': 'application/octet-stream',
+            'Content-Length': str(os.path.getsize(path)),
+            'Content-Disposition': f"attachment; filename*=UTF-8''{quote(name)}",
+        }
+        await send_head(writer, 200, headers, start)
+        with open(path, 'rb') as file:
+            while True:
+                chunk = file.read(UPLOAD_CHUNK)
+                if not chunk:
+                    break
+                writer.write(chunk)
+                await writer.drain()
+        return 200
+
+
+def job_options(base, query, headers, output_directory):
+    unknown = sorted(set(query) - set(JOB_PARAMETERS))
+    if unknown:
+        raise HTTPError(400, f"Unknown parameters: {', '.join(unknown)}; allowed: {', '.join(JOB_PARAMETERS)}")
+
+    def value(name):
+        return query[name][-1] if name in query else None
+
+    def flag(name):
+        return value(name) is not None and value(name).lower() in TRUE_VALUES
+
+    # The password travels in a header so it never shows up in URLs or request logs
+    options = replace(base, output_directory=output_directory, password=headers.get('x-pdf-password', ''))
+    if value('method'):
+        if value('method') not in EXTRACTION_METHODS:
+            raise HTTPError(400, f"method must be one of {', '.join(EXTRACTION_METHODS)}")
+        options.conversion_method = value('method')
+    if value('format'):
+        if value('format') not in OUTPUT_FORMATS:
+            raise HTTPError(400, f"format must be one of {', '.join(OUTPUT_FORMATS)}")
+        options.output_format = value('format')
+    if value('pages'):
+        options.extract_all_pages = False
+        options.page_range = value('pages')
+    if value('stitch') is not None:
+        options.stitch_tables = flag('stitch')
+    if value('infer_types') is not None:
+        options.infer_types = flag('infer_types')
+    if value('metadata') is not None:
+        options.include_metadata = flag('metadata')
+    if value('no_format') is not None:
+        options.format_output = not flag('no_format')
+    return options
+
+
+async def read_head(reader):
+    request_line = await reader.readline()
+    if not request_line:
+        raise ConnectionError("Connection closed before a request")
+    try:
+        method, target, _ = request_line.decode('latin-1').split()
+    except ValueError:
+        raise HTTPError(400, "Malformed request line")
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+    return method.upper(), target, headers
+
+
+async def send_head(writer, status, headers, start):
+    # Server-Timing lets clients see how long the service spent before the body
+    lines = [f"HTTP/1.1 {status} {REASONS.get(status, '')}"]
+    headers = dict(headers, Connection='close')
+    headers['Server-Timing'] = f"app;dur={(time.perf_counter() - start) * 1000:.1f}"
+    lines += [f"{name}: {value}" for name, value in headers.items()]
+    writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1'))
+    await writer.drain()
+
+
+async def send_json(writer, status, payload, start, headers=None):
+    body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+    head = dict(headers or {}, **{'Content-Type': 'application/json', 'Content-Length': str(len(body))})
+    if status == 503:
+        head['Retry-After'] = '5'
+    await send_head(writer, status, head, start)
+    writer.write(body)
+    await writer.drain()
+    return status
+
+
+def console_logger(message):
+    print(timestamped(message), flush=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve PDF to Excel conversions over local HTTP.")
+    parser.add_argument('--host', default='127.0.0.1', help="Address to listen on (default: 127.0.0.1)")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('-m', '--method', choices=EXTRACTION_METHODS, help="Engine the workers are warmed for")
+    parser.add_argument('-w', '--workers', type=int, help="Conversions run at once (default: one per CPU)")
+    parser.add_argument('--queue-size', type=int, default=100, help="Jobs waiting for a worker before 503s")
+    parser.add_argument('--max-upload-mb', type=int, default=100)
+    parser.add_argument('--work-dir', default='service_jobs', help="Where uploads and results are kept")
+    parser.add_argument('--retain-minutes', type=int, default=60, help="How long finished jobs stay downloadable")
+    parser.add_argument('--max-worker-memory', type=int, metavar='MB',
+                        help="Replace the workers once one holds more than this much memory after a job")
+    parser.add_argument('--metrics-jsonl', help="Append per-stage timings for every job to this JSON-lines file")
+    parser.add_argument('--prometheus', help="Write aggregated stage timings to this Prometheus text file")
+    parser.add_argument('--settings', default=SETTINGS_FILE, help="Settings file jobs start from")
+    args = parser.parse_args(argv)
+
+    options = load_options(args.settings)
+    if args.method:
+        options.conversion_method = args.method
+    if args.workers is not None:
+        options.workers = args.workers
+    if args.max_worker_memory is not None:
+        options.max_worker_memory_mb = args.max_worker_memory
+    if args.metrics_jsonl:
+        options.metrics_file = args.metrics_jsonl
+    if args.prometheus:
+        options.prometheus_file = args.prometheus
+
+    service = ConversionService(options, os.path.abspath(args.work_dir), logger=console_logger,
+                                queue_size=args.queue_size, max_upload_mb=args.max_upload_mb,
+                                retain_minutes=args.retain_minutes)
+
+    async def run():
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(signum, stop.set)
+            except (NotImplementedError, RuntimeError):
+                # Windows event loops have no signal handlers; Ctrl+C still raises KeyboardInterrupt
+                pass
+        await service.serve(args.host, args.port, stop)
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
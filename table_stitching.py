@@ -0,0 +1,93 @@
+"""Joins table fragments that continue across pages into one table each.
+
+A fragment continues the table before it when it has the same number of
+columns and either the same header or a header row that is really data,
+which is what a page without a repeated header produces. Fragments of one
+logical table are joined with a single ``pd.concat`` and header rows
+repeated inside the result are dropped in one vectorised comparison.
+"""
+import re
+import pandas as pd
+
+NUMBER_OR_DATE = re.compile(r"^[-+(]?[$€£]?\s*\d[\d,.\s]*\)?%?$|^\d{1,4}[-/.]\d{1,2}[-/.]\d{1,4}$")
+
+
+def normalized(value):
+    if value is None or (isinstance(value, float) and value != value):
+        return ''
+    return ' '.join(str(value).split()).lower()
+
+
+def has_default_columns(table):
+    # camelot, and pandas for header-less rows, number columns 0..n-1 and keep the header in row 0
+    return list(table.columns) == list(range(len(table.columns)))
+
+
+def header_cells(table):
+    if has_default_columns(table):
+        return list(table.iloc[0]) if len(table) else []
+    return list(table.columns)
+
+
+def looks_like_data(cells):
+    return any(NUMBER_OR_DATE.match(normalized(cell)) for cell in cells)
+
+
+def continuation(lead, table):
+    """How ``table`` continues ``lead``: 'header' if it repeats the header, 'data' if its
+    header row is actually the first data row, or None if it starts a new table."""
+    if len(table.columns) != len(lead.columns):
+        return None
+    lead_header = [normalized(cell) for cell in header_cells(lead)]
+    header = [normalized(cell) for cell in header_cells(table)]
+    if header == lead_header:
+        return 'header'
+    if not has_default_columns(table) and looks_like_data(header) and not looks_like_data(lead_header):
+        return 'data'
+    return None
+
+
+def drop_repeated_headers(table, header, keep_first):
+    cleaned = table.astype(object).where(table.notna(), '').astype(str)
+    cleaned = cleaned.apply(lambda column: column.str.replace(r'\s+', ' ', regex=True).str.strip().str.lower())
+    repeated = (cleaned == header).all(axis=1)
+    if keep_first and len(repeated):
+        repeated.iloc[0] = False
+    if not repeated.any():
+        return table
+    return table[~repeated.to_numpy()].reset_index(drop=True)
+
+
+def combine(fragments):
+    lead = fragments[0]
+    if len(fragments) == 1:
+        return lead
+    header = [normalized(cell) for cell in header_cells(lead)]
+    frames = [fragment.set_axis(lead.columns, axis=1) for fragment in fragments]
+    table = pd.concat(frames, ignore_index=True)
+    return drop_repeated_headers(table, header, keep_first=has_default_columns(lead))
+
+
+def stitch_tables(tables, stats=None):
+    """Yield one table per run of continuation fragments; ``stats`` counts fragments and tables."""
+    fragments = []
+    for table in tables:
+        if stats is not None:
+            stats['fragments'] = stats.get('fragments', 0) + 1
+        kind = continuation(fragments[0], table) if fragments else None
+        if kind is None:
+            if fragments:
+                yield combine(fragments)
+                if stats is not None:
+                    stats['tables'] = stats.get('tables', 0) + 1
+            fragments = [table]
+        elif kind == 'data':
+            # The parser promoted the first data row to the header; put it back as a row
+            fragments.append(pd.DataFrame([list(table.columns)], columns=table.columns))
+            fragments.append(table)
+        else:
+            fragments.append(table)
+    if fragments:
+        yield combine(fragments)
+        if stats is not None:
+            stats['tables'] = stats.get('tables', 0) + 1
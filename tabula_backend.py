@@ -0,0 +1,55 @@
+"""Keeps one tabula-java JVM alive per process so tabula calls skip Java startup.
+
+tabula-py runs tabula-java in-process through jpype when it is installed and
+reuses an already running JVM; without jpype every ``read_pdf`` call launches
+a fresh ``java`` subprocess. Worker processes call :func:`prepare_engine` once
+when they start so the JVM is up before the first file arrives.
+"""
+import os
+import time
+import shutil
+import importlib.util
+
+# The options tabula-py itself would pass, so it never warns about mismatched JVM flags
+JAVA_OPTIONS = [
+    "-Djava.awt.headless=true",
+    "-Dfile.encoding=UTF8",
+    "-Dorg.slf4j.simpleLogger.defaultLogLevel=off",
+    "-Dorg.apache.commons.logging.Log=org.apache.commons.logging.impl.NoOpLog",
+]
+
+
+def jpype_available():
+    return importlib.util.find_spec('jpype') is not None
+
+
+def tabula_usable():
+    # tabula needs a Java runtime either way: on PATH for subprocess mode, or JAVA_HOME for jpype
+    return shutil.which('java') is not None or bool(os.environ.get('JAVA_HOME'))
+
+
+def start_jvm():
+    """Start the shared JVM; returns the startup time, or None in subprocess mode."""
+    if not jpype_available():
+        return None
+
+    import jpype
+    from tabula.backend import jar_path
+
+    if jpype.isJVMStarted():
+        return 0.0
+    start = time.perf_counter()
+    jpype.addClassPath(jar_path())
+    jpype.startJVM(*JAVA_OPTIONS, convertStrings=False)
+    return time.perf_counter() - start
+
+
+def prepare_engine(conversion_method):
+    # Process-pool initializer: pay engine startup once per worker, not once per file.
+    # A failure here would break the whole pool, so it is left for the first
+    # tabula call to report against the file that triggered it.
+    if conversion_method in ("tabula", "auto") and tabula_usable():
+        try:
+            start_jvm()
+        except Exception:
+            pass
@@ -0,0 +1,114 @@
+"""Turns extracted text columns into numbers and dates with whole-column pandas operations.
+
+Extractors hand back every cell as text. A column is converted only when
+every non-blank cell parses, so a column of reference numbers with one
+stray letter stays text rather than losing that cell. Values with leading
+zeros, or with more significant digits than Excel keeps, stay text too. Numbers may carry
+thousands separators, currency symbols, a leading or trailing minus or
+accounting parentheses for negatives. Dates are tried against a fixed list
+of formats, never guessed cell by cell.
+"""
+import pandas as pd
+from table_stitching import has_default_columns
+
+CURRENCY_SYMBOLS = r'[$€£¥₹]|\b(?:USD|EUR|GBP|CHF|JPY)\b'
+THOUSANDS = r'^-?\d{1,3}(?:,\d{3})+(?:\.\d+)?$'
+PLAIN_NUMBER = r'^-?(?:\d+(?:\.\d*)?|\.\d+)$'
+# Shapes every DATE_FORMATS value has, checked before any format is tried
+DATE_SHAPE = r'^(?:\d{1,4}[-/. ][0-9A-Za-z]{1,9}[-/. ]\d{2,4}|[A-Za-z]{3,9} \d{1,2}, \d{4})$'
+DATE_FORMATS = ('%Y-%m-%d', '%m/%d/%Y', '%d/%m/%Y', '%d.%m.%Y', '%Y/%m/%d', '%d-%b-%Y', '%d %b %Y',
+                '%b %d, %Y', '%d %B %Y', '%B %d, %Y', '%m/%d/%y', '%d/%m/%y')
+# Significant digits an Excel number keeps; longer values stay text
+MAX_DIGITS = 15
+INT64_MAX = 2 ** 63 - 1
+# Values checked before a whole column is parsed, so text columns are rejected cheaply
+SAMPLE = 50
+
+
+def text_values(column):
+    # Stripped strings with blanks as missing values
+    values = column.astype('string').str.strip()
+    return values.mask(values == '')
+
+
+def parse_numbers(values):
+    numbers = pd.to_numeric(values, errors='coerce')
+    if numbers.notna().all():
+        cleaned = values
+    else:
+        cleaned = values.str.replace(CURRENCY_SYMBOLS, '', regex=True).str.replace(r'\s+', '', regex=True)
+        negative = cleaned.str.match(r'^\(.*\)$') | cleaned.str.endswith('-')
+        cleaned = cleaned.str.replace(r'^\((.*)\)$', r'\1', regex=True).str.replace(r'-$', '', regex=True)
+        grouped = cleaned.str.match(THOUSANDS)
+        cleaned = cleaned.where(~grouped, cleaned.str.replace(',', '', regex=False))
+        if not cleaned.str.match(PLAIN_NUMBER).all():
+            return None
+        numbers = pd.to_numeric(cleaned)
+        numbers = numbers.where(~negative.astype(bool), -numbers.abs())
+    # Leading zeros mark codes (account numbers, zip codes) that must stay text
+    if cleaned.str.match(r'^-?0\d').any():
+        return None
+    # Card, account and reference numbers longer than Excel's 15 significant digits would lose digits
+    digits = cleaned.str.replace(r'[eE].*$', '', regex=True).str.replace(r'\D', '', regex=True).str.strip('0')
+    if (digits.str.len() > MAX_DIGITS).any():
+        return None
+    integers = pd.api.types.is_integer_dtype(numbers)
+    if integers and (numbers > INT64_MAX).any():
+        return None
+    return numbers.astype('Int64' if integers else 'float64')
+
+
+def to_numbers(values):
+    """Parsed numbers for the distinct non-blank ``values``, or None unless every one is numeric."""
+    if values.empty or (len(values) > SAMPLE and parse_numbers(values.head(SAMPLE)) is None):
+        return None
+    return parse_numbers(values)
+
+
+def to_dates(values):
+    """Parsed dates for the distinct non-blank ``values`` in the first format that fits them all, or None."""
+    sample = values.head(SAMPLE)
+    if values.empty or not sample.str.match(DATE_SHAPE).all():
+        return None
+    for date_format in DATE_FORMATS:
+        if len(values) > SAMPLE and pd.to_datetime(sample, format=date_format, errors='coerce').isna().any():
+            continue
+        dates = pd.to_datetime(values, format=date_format, errors='coerce')
+        if dates.notna().all():
+            return dates
+    return None
+
+
+def infer_column(column):
+    if not (column.dtype == object or isinstance(column.dtype, pd.StringDtype)):
+        return column
+    # Each distinct value is parsed once; extracted columns repeat dates, codes and amounts a lot
+    codes, distinct = pd.factorize(text_values(column))
+    distinct = pd.Series(distinct, dtype='string')
+    converted = to_numbers(distinct)
+    if converted is None:
+        converted = to_dates(distinct)
+    if converted is None:
+        return column
+    return pd.Series(pd.api.extensions.take(converted.array, codes, allow_fill=True), index=column.index)
+
+
+def convert_columns(table):
+    converted = [infer_column(table.iloc[:, position]) for position in range(len(table.columns))]
+    if not converted:
+        return table.copy()
+    result = pd.concat(converted, axis=1, ignore_index=True)
+    return result.set_axis(table.columns, axis=1).set_axis(table.index, axis=0)
+
+
+def infer_types(table):
+    """A copy of ``table`` with every fully numeric or fully date-like text column converted.
+
+    Tables whose header is still in row 0 (camelot's numbered columns) have
+    that row promoted to the column names, so the typed columns reach the
+    writers as they are.
+    """
+    if has_default_columns(table) and len(table) > 1:
+        header = ['' if pd.isna(cell) else str(cell).strip() for cell in table.iloc[0]]
+        table = table.iloc[1:].reset_index(drop=True).set_axis(header, axis=1)
+    return convert_columns(table)
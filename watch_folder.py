@@ -0,0 +1,290 @@
+"""Long-running watch mode: converts PDFs as they are dropped into a directory.
+
+New files are picked up from inotify on Linux, or by polling the directory
+elsewhere and on network shares where inotify misses remote writes. A file
+is only queued once its size and mtime have stopped changing and it ends
+with a PDF trailer, so half-copied files are never converted. Ready files
+wait in a bounded queue in front of a process pool running the same
+conversion task as batches; when the queue is full, newly settled files
+stay where they are until there is room.
+"""
+import os
+import sys
+import time
+import ctypes
+import select
+import struct
+import ctypes.util
+import statistics
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import replace
+from batch import convert_file_task, over_memory_ceiling, resolve_workers, worker_pool
+from job_journal import JOURNAL_FILE, JobJournal, output_settings_key
+from memory_limits import MB
+
+IN_CREATE = 0x100
+IN_CLOSE_WRITE = 0x8
+IN_MOVED_TO = 0x80
+IN_Q_OVERFLOW = 0x4000
+IN_NONBLOCK = os.O_NONBLOCK
+EVENT_HEADER = struct.Struct('iIII')
+
+# Seconds between full directory rescans in polling mode, in case mtimes are coarse
+RESCAN_SECONDS = 60
+# Seconds between latency summaries in the log
+STATS_SECONDS = 60
+# Bytes at the end of a file searched for the PDF trailer
+TRAILER_BYTES = 2048
+# Seconds a settled file may go without a PDF trailer before it is given up on
+TRAILER_TIMEOUT = 60
+# Most recent per-file latencies kept for the summaries
+LATENCY_WINDOW = 10000
+
+
+def is_candidate(name):
+    # Skips hidden files and the lock/temp files editors and copy tools leave behind
+    return name.lower().endswith('.pdf') and not name.startswith(('.', '~$'))
+
+
+def has_pdf_trailer(path):
+    try:
+        with open(path, 'rb') as file:
+            file.seek(max(0, os.path.getsize(path) - TRAILER_BYTES))
+            return b'%%EOF' in file.read()
+    except OSError:
+        return False
+
+
+class InotifySource:
+    """Names of files created, closed after writing or moved into a directory."""
+
+    def __init__(self, directory):
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self.directory = directory
+        self.fd = libc.inotify_init1(IN_NONBLOCK)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        if libc.inotify_add_watch(self.fd, os.fsencode(directory), IN_CREATE | IN_CLOSE_WRITE | IN_MOVED_TO) < 0:
+            os.close(self.fd)
+            raise OSError(ctypes.get_errno(), f"cannot watch {directory}")
+
+    def changes(self, timeout):
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return []
+        data = os.read(self.fd, 64 * 1024)
+        names = []
+        offset = 0
+        while offset < len(data):
+            _, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            if mask & IN_Q_OVERFLOW:
+                # The kernel dropped events; fall back to one listing
+                names.extend(entry.name for entry in os.scandir(self.directory) if entry.is_file())
+            elif length:
+                names.append(os.fsdecode(data[offset:offset + length].rstrip(b'\0')))
+            offset += length
+        return names
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingSource:
+    """Names of files new to a directory, listing it only when its mtime moves."""
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.known = set()
+        self.directory_mtime = None
+        self.last_rescan = 0.0
+
+    def changes(self, timeout):
+        time.sleep(timeout)
+        mtime = os.stat(self.directory).st_mtime_ns
+        if mtime == self.directory_mtime and time.monotonic() - self.last_rescan < RESCAN_SECONDS:
+            return []
+        self.directory_mtime = mtime
+        self.last_rescan = time.monotonic()
+        names = {entry.name for entry in os.scandir(self.directory) if entry.is_file()}
+        added = names - self.known
+        self.known = names
+        return sorted(added)
+
+    def close(self):
+        pass
+
+
+def open_source(directory, use_polling=False):
+    if not use_polling and sys.platform.startswith('linux'):
+        try:
+            return InotifySource(directory), "inotify"
+        except OSError:
+            pass
+    return PollingSource(directory), "polling"
+
+
+class FolderWatcher:
+    def __init__(self, directory, options, logger=None, settle_seconds=2.0, queue_size=100,
+                 poll_interval=1.0, use_polling=False):
+        self.directory = directory
+        # Watch mode always journals, so restarts and rewritten-but-identical files are skipped
+        self.options = replace(options, resume=True)
+        self.logger = logger
+        self.settle_seconds = settle_seconds
+        self.queue_size = queue_size
+        self.poll_interval = poll_interval
+        self.use_polling = use_polling
+        self.settling = {}
+        self.ready = deque()
+        self.in_flight = {}
+        # Paths in ready or in_flight, so events for them are not tracked twice
+        self.claimed = set()
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self.converted = 0
+        self.deferred_logged = False
+        # Set when a worker died or went over the memory ceiling; the pool is replaced once idle
+        self.recycle = False
+
+    def log(self, message):
+        if self.logger:
+            self.logger(message)
+
+    def run(self, stop_event):
+        source, kind = open_source(self.directory, self.use_polling)
+        workers = resolve_workers(self.options.workers, sys.maxsize)
+        journal_path = self.options.journal_file or os.path.join(self.options.output_directory, JOURNAL_FILE)
+        self.log(f"Watching {self.directory} ({kind}) with {workers} worker(s), queue of {self.queue_size}")
+
+        executor = worker_pool(self.options, workers)
+        try:
+            with JobJournal(journal_path) as journal:
+                settings_key = output_settings_key(self.options)
+                for entry in os.scandir(self.directory):
+                    if entry.is_file():
+                        self.track(entry.name)
+                last_stats = time.monotonic()
+
+                while not stop_event.is_set():
+                    busy = self.settling or self.ready or self.in_flight
+                    for name in source.changes(min(0.25, self.poll_interval) if busy else self.poll_interval):
+                        self.track(name)
+                    self.settle(journal, settings_key)
+                    self.dispatch(executor, workers)
+                    self.collect(journal, settings_key, timeout=0)
+                    if self.recycle and not self.in_flight:
+                        executor.shutdown()
+                        executor = worker_pool(self.options, workers)
+                        self.recycle = False
+                    if time.monotonic() - last_stats >= STATS_SECONDS and self.latencies:
+                        self.log_stats()
+                        last_stats = time.monotonic()
+
+                if self.in_flight:
+                    self.log(f"Stopping: waiting for {len(self.in_flight)} file(s) in progress")
+                while self.in_flight:
+                    self.collect(journal, settings_key, timeout=None)
+        finally:
+            executor.shutdown()
+            source.close()
+        if self.latencies:
+            self.log_stats()
+        self.log("Stopped watching")
+
+    def track(self, name):
+        path = os.path.join(self.directory, name)
+        if is_candidate(name) and path not in self.claimed:
+            # (size, mtime, time the file was first seen, time it last changed)
+            previous = self.settling.get(path)
+            now = time.monotonic()
+            self.settling[path] = (None, None, previous[2] if previous else now, now)
+
+    def settle(self, journal, settings_key):
+        now = time.monotonic()
+        for path, (size, mtime, seen, changed) in list(self.settling.items()):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                del self.settling[path]
+                continue
+            if (stat.st_size, stat.st_mtime_ns) != (size, mtime):
+                self.settling[path] = (stat.st_size, stat.st_mtime_ns, seen, now)
+                continue
+            if now - changed < self.settle_seconds:
+                continue
+            if not has_pdf_trailer(path):
+                if now - changed >= self.settle_seconds + TRAILER_TIMEOUT:
+                    # Unchanged but not a complete PDF: truncated, or not a PDF at all
+                    del self.settling[path]
+                    self.log(f"✗ Failed to convert {os.path.basename(path)}: no PDF trailer after "
+                             f"{now - changed:.0f}s unchanged")
+                    journal.record({'file': path, 'success': False, 'output_file': None, 'source': None},
+                                   settings_key)
+                continue
+            if len(self.ready) >= self.queue_size:
+                if not self.deferred_logged:
+                    self.log(f"Queue full ({self.queue_size}); holding newly arrived files until it drains")
+                    self.deferred_logged = True
+                return
+
+            del self.settling[path]
+            if journal.is_complete(path, settings_key):
+                continue
+            self.ready.append((path, seen, now))
+            self.claimed.add(path)
+            self.deferred_logged = False
+
+    def dispatch(self, executor, workers):
+        while self.ready and len(self.in_flight) < workers and not self.recycle:
+            path, seen, queued = self.ready.popleft()
+            future = executor.submit(convert_file_task, path, self.options)
+            self.in_flight[future] = (path, seen, queued, time.monotonic())
+
+    def collect(self, journal, settings_key, timeout):
+        if not self.in_flight:
+            return
+        done, _ = wait(self.in_flight, timeout=timeout, return_when=FIRST_COMPLETED)
+        for future in done:
+            path, seen, queued, started = self.in_flight.pop(future)
+            self.claimed.discard(path)
+            finished = time.monotonic()
+            name = os.path.basename(path)
+            try:
+                result = future.result()
+            except Exception as e:
+                result = {'file': path, 'success': False, 'output_file': None,
+                          'messages': [f"Worker failed on {name}: {str(e)}"], 'source': None}
+                if isinstance(e, BrokenProcessPool):
+                    self.recycle = True
+            for message in result['messages']:
+                self.log(message)
+            if over_memory_ceiling(result, self.options) and not self.recycle:
+                self.recycle = True
+                self.log(f"Worker holds {result['memory']['rss'] / MB:.0f} MB after {name}, over the "
+                         f"{self.options.max_worker_memory_mb} MB ceiling; recycling workers")
+            journal.record(result, settings_key)
+
+            self.latencies.append(finished - seen)
+            self.converted += 1
+            timing = (f"{finished - seen:.1f}s (settle {queued - seen:.1f}s, queue {started - queued:.1f}s, "
+                      f"convert {finished - started:.1f}s)")
+            memory = result.get('memory')
+            if memory and (self.options.memory_bounded or self.options.max_worker_memory_mb):
+                timing += f", peak memory {memory['peak'] / MB:.0f} MB"
+            if result['success']:
+                self.log(f"✓ Converted {name} in {timing}")
+            else:
+                self.log(f"✗ Failed to convert {name} after {timing}")
+
+    def log_stats(self):
+        latencies = sorted(self.latencies)
+        if len(latencies) > 1:
+            cuts = statistics.quantiles(latencies, n=20, method='inclusive')
+            p50, p95 = cuts[9], cuts[18]
+        else:
+            p50 = p95 = latencies[0]
+        self.log(f"Watch stats: {self.converted} files, latency p50 {p50:.1f}s, p95 {p95:.1f}s, "
+                 f"max {latencies[-1]:.1f}s; {len(self.ready)} queued, {len(self.in_flight)} converting, "
+                 f"{len(self.settling)} settling")
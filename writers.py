@@ -0,0 +1,243 @@
+"""Table output writers: openpyxl write-only and xlsxwriter workbooks, CSV and Parquet files.
+
+Every writer takes DataFrames one at a time under a sheet name, so tables
+can be written as extraction produces them.
+"""
+import os
+
+MAX_COLUMN_WIDTH = 50
+HEADER_COLOR = "#366092"
+
+
+def header_styles():
+    from openpyxl.styles import Font, PatternFill, Alignment
+
+    return {
+        'fill': PatternFill(start_color="366092", end_color="366092", fill_type="solid"),
+        'font': Font(color="FFFFFF", bold=True),
+        'alignment': Alignment(horizontal="center"),
+    }
+
+
+def column_widths(table, sample_rows=None):
+    """Column widths for ``table`` computed column-wise with pandas string ops.
+
+    Missing values count as empty cells. ``sample_rows`` caps how many rows
+    are measured; ``None`` measures every row.
+    """
+    if sample_rows:
+        table = table.head(sample_rows)
+    widths = []
+    for position, column in enumerate(table.columns):
+        values = table.iloc[:, position]
+        longest = len(str(column)) if column is not None else 0
+        if len(values):
+            lengths = values.astype(str).str.len().where(values.notna(), 0)
+            longest = max(longest, int(lengths.max()))
+        widths.append(min(longest + 2, MAX_COLUMN_WIDTH))
+    return widths
+
+
+def apply_column_widths(worksheet, widths):
+    from openpyxl.utils import get_column_letter
+
+    for col_num, width in enumerate(widths, 1):
+        worksheet.column_dimensions[get_column_letter(col_num)].width = width
+
+
+def with_date_cells(table):
+    # Inferred dates carry no time of day; as date objects the Excel writers format them date-only
+    positions = [position for position, dtype in enumerate(table.dtypes) if dtype.kind == 'M']
+    if not positions:
+        return table
+    table = table.copy()
+    for position in positions:
+        column = table.iloc[:, position]
+        table.isetitem(position, column.dt.date.astype(object).where(column.notna(), None))
+    return table
+
+
+def dataframe_rows(table):
+    # NaN/NA become empty cells, matching DataFrame.to_excel
+    table = with_date_cells(table)
+    cleaned = table.astype(object).where(table.notna(), None)
+    return cleaned.itertuples(index=False, name=None)
+
+
+def named_tables(tables):
+    """Pair tables with sheet names: a lone table is ``Data``, several are ``Table_1``..``Table_N``.
+
+    One table of lookahead is enough to tell the two cases apart, so names
+    are known before anything is written.
+    """
+    tables = iter(tables)
+    first = next(tables, None)
+    if first is None:
+        return
+    second = next(tables, None)
+    if second is None:
+        yield "Data", first
+        return
+    yield "Table_1", first
+    yield "Table_2", second
+    for number, table in enumerate(tables, 3):
+        yield f"Table_{number}", table
+
+
+def unique_column_names(columns):
+    # Parquet needs distinct string column names; extracted headers are often blank or repeated
+    names = []
+    seen = set()
+    for position, column in enumerate(columns, 1):
+        name = str(column).strip() if column is not None else ''
+        name = name or f"column_{position}"
+        candidate, suffix = name, 2
+        while candidate in seen:
+            candidate, suffix = f"{name}_{suffix}", suffix + 1
+        seen.add(candidate)
+        names.append(candidate)
+    return names
+
+
+class StreamingExcelWriter:
+    """Appends rows straight to a write-only workbook.
+
+    Write-only sheets emit column widths before the first row, so widths
+    come from :func:`column_widths` on the DataFrame up front. Rows are then
+    written as they are produced and never kept in memory.
+    """
+
+    extension = '.xlsx'
+
+    def __init__(self, output_file, format_output=True, sample_rows=None):
+        from openpyxl import Workbook
+
+        self.output_file = output_file
+        self.format_output = format_output
+        self.sample_rows = sample_rows
+        self.workbook = Workbook(write_only=True)
+        self.sheets = []
+        self.files = []
+
+    def write_dataframe(self, sheet_name, table, styled=True):
+        worksheet = self.workbook.create_sheet(title=sheet_name)
+        self.sheets.append(worksheet)
+        columns = ['' if column is None else column for column in table.columns]
+
+        if self.format_output and styled:
+            apply_column_widths(worksheet, column_widths(table, self.sample_rows))
+            worksheet.append(self.header_row(worksheet, columns))
+        else:
+            worksheet.append(columns)
+        for row in dataframe_rows(table):
+            worksheet.append(row)
+        return worksheet
+
+    def header_row(self, worksheet, columns):
+        from openpyxl.cell import WriteOnlyCell
+
+        styles = header_styles()
+        cells = []
+        for column in columns:
+            cell = WriteOnlyCell(worksheet, value=column)
+            cell.fill = styles['fill']
+            cell.font = styles['font']
+            cell.alignment = styles['alignment']
+            cells.append(cell)
+        return cells
+
+    def save(self):
+        self.workbook.save(self.output_file)
+        self.files = [self.output_file]
+
+
+class XlsxWriterOutput:
+    """Workbook written by xlsxwriter in constant-memory mode, which flushes each row as it goes.
+
+    Cells come out the same as the openpyxl writers: a styled header row and
+    column widths from :func:`column_widths` when formatting is on.
+    """
+
+    extension = '.xlsx'
+
+    def __init__(self, output_file, format_output=True, sample_rows=None):
+        import xlsxwriter
+
+        self.output_file = output_file
+        self.format_output = format_output
+        self.sample_rows = sample_rows
+        self.workbook = xlsxwriter.Workbook(output_file, {'constant_memory': True, 'nan_inf_to_errors': True,
+                                                        'default_date_format': 'yyyy-mm-dd'})
+        self.header_format = self.workbook.add_format({
+            'bg_color': HEADER_COLOR, 'font_color': '#FFFFFF', 'bold': True, 'align': 'center',
+        })
+        self.files = []
+
+    def write_dataframe(self, sheet_name, table, styled=True):
+        worksheet = self.workbook.add_worksheet(sheet_name)
+        columns = ['' if column is None else column for column in table.columns]
+        if self.format_output and styled:
+            for col_num, width in enumerate(column_widths(table, self.sample_rows)):
+                worksheet.set_column(col_num, col_num, width)
+            worksheet.write_row(0, 0, columns, self.header_format)
+        else:
+            worksheet.write_row(0, 0, columns)
+        for row_num, row in enumerate(dataframe_rows(table), 1):
+            worksheet.write_row(row_num, 0, row)
+        return worksheet
+
+    def save(self):
+        self.workbook.close()
+        self.files = [self.output_file]
+
+
+class CSVOutput:
+    """One CSV file per table: ``<name>.csv`` for a lone ``Data`` table, else ``<name>_<sheet>.csv``."""
+
+    extension = '.csv'
+
+    def __init__(self, output_file, format_output=True, sample_rows=None):
+        self.base_path = os.path.splitext(output_file)[0]
+        self.files = []
+
+    def table_path(self, sheet_name):
+        if sheet_name == "Data":
+            return self.base_path + self.extension
+        return f"{self.base_path}_{sheet_name}{self.extension}"
+
+    def write_dataframe(self, sheet_name, table, styled=True):
+        path = self.table_path(sheet_name)
+        table.to_csv(path, index=False, encoding='utf-8')
+        self.files.append(path)
+
+    def save(self):
+        pass
+
+
+class ParquetOutput(CSVOutput):
+    """One Parquet file per table, named like :class:`CSVOutput`; needs pyarrow."""
+
+    extension = '.parquet'
+
+    def __init__(self, output_file, format_output=True, sample_rows=None):
+        import pyarrow  # noqa: F401 - fail on the first file rather than after extraction
+
+        super().__init__(output_file, format_output, sample_rows)
+
+    def write_dataframe(self, sheet_name, table, styled=True):
+        table = table.set_axis(unique_column_names(table.columns), axis=1)
+        # Extracted text columns can mix str, numbers and None, which Arrow cannot store as one type
+        text_columns = [column for column in table.columns if table[column].dtype == object]
+        if text_columns:
+            table = table.astype({column: 'string' for column in text_columns})
+        path = self.table_path(sheet_name)
+        table.to_parquet(path, index=False)
+        self.files.append(path)
+
+
+OUTPUT_WRITERS = {
+    'xlsx': StreamingExcelWriter,
+    'xlsxwriter': XlsxWriterOutput,
+    'csv': CSVOutput,
+    'parquet': ParquetOutput,
+}